@@ -0,0 +1,106 @@
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from text_to_textnodes import text_to_textnodes
+from textnode import TextNode, TextType
+
+SENTENCE = (
+    "Read **the guide** and _the notes_, run `make test`, look at "
+    "![diagram](/images/diagram.png) and follow [the docs](https://example.com/docs). "
+)
+
+
+LINK = "see [page](https://example.com/page) "
+
+
+# The five-pass tokenizer as it was before the single-pass scanner, frozen
+# here so later changes to split_nodes do not move the baseline.
+def five_pass_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def split_nodes_delimiter(old_nodes, delimiter, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        parts = node.text.split(delimiter)
+        if len(parts) % 2 == 0:
+            raise ValueError(f"Invalid Markdown: unmatched delimiter '{delimiter}'")
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                if part or (i == 0 and len(parts) == 1):
+                    new_nodes.append(TextNode(part, TextType.TEXT))
+            else:
+                new_nodes.append(TextNode(part, text_type))
+    return new_nodes
+
+
+def split_nodes_image(old_nodes):
+    return split_nodes_markdown(
+        old_nodes, r"!\[(.*?)\]\((.*?)\)", "![{}]({})", TextType.IMAGE
+    )
+
+
+def split_nodes_link(old_nodes):
+    return split_nodes_markdown(
+        old_nodes, r"(?<!!)\[(.*?)\]\((.*?)\)", "[{}]({})", TextType.LINK
+    )
+
+
+def split_nodes_markdown(old_nodes, pattern, markdown, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        matches = re.findall(pattern, node.text)
+        if not matches:
+            new_nodes.append(node)
+            continue
+        curr_text = node.text
+        for text, url in matches:
+            sections = curr_text.split(markdown.format(text, url), 1)
+            if sections[0]:
+                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            new_nodes.append(TextNode(text, text_type, url=url))
+            curr_text = sections[1]
+        if curr_text:
+            new_nodes.append(TextNode(curr_text, TextType.TEXT))
+    return new_nodes
+
+
+def best_of(func, text, number):
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+
+def compare(label, unit, counts):
+    print(f"{label:>10} {'five-pass':>12} {'single-pass':>12} {'speedup':>8}")
+    for count in counts:
+        text = unit * count
+        assert text_to_textnodes(text) == five_pass_textnodes(text)
+        number = max(1, 2000 // count)
+        old = best_of(five_pass_textnodes, text, number)
+        new = best_of(text_to_textnodes, text, number)
+        print(f"{count:>10} {old * 1e3:>10.3f}ms {new * 1e3:>10.3f}ms {old / new:>7.1f}x")
+
+
+def main():
+    compare("sentences", SENTENCE, (1, 10, 100, 1000))
+    print()
+    compare("links", LINK, (10, 100, 1000, 10000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from corpus import BLOCKS
+from generate_page import generate_page_stream
+from markdown_to_html_node import markdown_to_html_node
+from page_template import PageTemplate
+from text_to_textnodes import text_to_textnodes
+
+
+def large_page(blocks, seed):
+    rng = random.Random(seed)
+    kinds = list(BLOCKS)
+    return "# Large page\n\n" + "\n\n".join(
+        BLOCKS[rng.choice(kinds)](rng) for _ in range(blocks)
+    )
+
+
+def count_nodes(node):
+    if not node.children:
+        return 1
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def traced(func):
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def traced_peak(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def page_peaks(markdown):
+    template = PageTemplate.compile("<title>{{ Title }}</title>{{ Content }}", "/")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "index.md")
+        dest = os.path.join(tmp, "index.html")
+        with open(source, "w") as file:
+            file.write(markdown)
+
+        def whole_file():
+            with open(source) as file:
+                content = file.read()
+            template.write(dest, "Large page", markdown_to_html_node(content).to_html())
+
+        whole_peak = traced_peak(whole_file)
+        stream_peak = traced_peak(
+            lambda: generate_page_stream(source, dest, template)
+        )
+    return whole_peak, stream_peak
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure node memory usage")
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    markdown = large_page(args.blocks, args.seed)
+    paragraphs = [
+        block.replace("\n", " ")
+        for block in markdown.split("\n\n")
+        if block[0] not in "#-`>0123456789"
+    ]
+    rss_before = peak_rss_mb()
+    html = markdown_to_html_node(markdown).to_html()
+    rss_after = peak_rss_mb()
+    del html
+
+    textnodes, textnode_bytes = traced(
+        lambda: [text_to_textnodes(paragraph) for paragraph in paragraphs]
+    )
+    textnode_count = sum(len(nodes) for nodes in textnodes)
+    textnode_bytes -= sys.getsizeof(textnodes) + sum(
+        sys.getsizeof(nodes) for nodes in textnodes
+    )
+    del textnodes
+
+    tree, tree_bytes = traced(lambda: markdown_to_html_node(markdown))
+    tree_count = count_nodes(tree)
+    del tree
+
+    whole_peak, stream_peak = page_peaks(markdown)
+
+    print(f"page: {len(markdown) / 1e6:.1f} MB markdown, {args.blocks} blocks")
+    print(
+        f"TextNode: {textnode_count} nodes, "
+        f"{textnode_bytes / textnode_count:.1f} bytes/node (including text)"
+    )
+    print(
+        f"HTML tree: {tree_count} nodes, "
+        f"{tree_bytes / tree_count:.1f} bytes/node (including text and lists)"
+    )
+    print(
+        f"peak RSS rendering the page: {rss_after:.1f} MB "
+        f"(before parsing: {rss_before:.1f} MB)"
+    )
+    print(
+        f"peak traced memory generating the page: "
+        f"{whole_peak / 1e6:.1f} MB whole file, {stream_peak / 1e6:.2f} MB streamed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import os
+import random
+
+SIZES = {"small": 10, "medium": 1000, "large": 100000}
+
+DEFAULT_MIX = {
+    "paragraph": 6,
+    "links": 2,
+    "heading": 2,
+    "unordered_list": 2,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1,
+}
+
+WORDS = (
+    "the ring of power was forged in the fires of mount doom by sauron "
+    "while elves dwarves and men received lesser rings from celebrimbor "
+    "frodo carried it across middle earth with samwise gamgee beside him"
+).split()
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+def generate_corpus(root, pages, mix=None, blocks=20, long_every=0, seed=0):
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    os.makedirs(os.path.join(root, "content"), exist_ok=True)
+    with open(os.path.join(root, "template.html"), "w") as file:
+        file.write(TEMPLATE)
+    write_static(root, rng)
+
+    for index in range(pages):
+        count = blocks * 50 if long_every and index % long_every == 0 else blocks
+        lines = [f"# Page {index} {sentence(rng, 3)}"]
+        for kind in rng.choices(kinds, weights, k=count):
+            lines.append(BLOCKS[kind](rng))
+        page_dir = os.path.join(root, "content", *page_path(index))
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.md"), "w") as file:
+            file.write("\n\n".join(lines) + "\n")
+
+
+def page_path(index):
+    return [f"section{index // 1000}", f"group{index // 100 % 10}", f"page{index}"]
+
+
+def write_static(root, rng):
+    images = os.path.join(root, "static", "images")
+    os.makedirs(images, exist_ok=True)
+    with open(os.path.join(root, "static", "index.css"), "w") as file:
+        file.write("body { font-family: serif; }\n" * 50)
+    for index in range(20):
+        with open(os.path.join(images, f"image{index}.png"), "wb") as file:
+            file.write(rng.randbytes(64 * 1024))
+
+
+def sentence(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def inline_text(rng, count):
+    words = []
+    for _ in range(count):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.1:
+            word = f"_{word}_"
+        elif roll < 0.13:
+            word = f"`{word}`"
+        words.append(word)
+    return " ".join(words)
+
+
+def paragraph(rng):
+    return "\n".join(inline_text(rng, 12) for _ in range(rng.randint(1, 4)))
+
+
+def link_paragraph(rng):
+    parts = []
+    for index in range(rng.randint(10, 40)):
+        if index % 7 == 0:
+            parts.append(f"![{rng.choice(WORDS)}](/images/image{index % 20}.png)")
+        else:
+            parts.append(f"[{sentence(rng, 2)}](/section0/page{index})")
+        parts.append(sentence(rng, 3))
+    return " ".join(parts)
+
+
+def heading(rng):
+    return f"{'#' * rng.randint(2, 6)} {inline_text(rng, 5)}"
+
+
+def unordered_list(rng):
+    return "\n".join(f"- {inline_text(rng, 8)}" for _ in range(rng.randint(2, 8)))
+
+
+def ordered_list(rng):
+    return "\n".join(
+        f"{number}. {inline_text(rng, 8)}" for number in range(1, rng.randint(3, 12))
+    )
+
+
+def quote(rng):
+    return "\n".join(f"> {inline_text(rng, 10)}" for _ in range(rng.randint(1, 4)))
+
+
+def code(rng):
+    body = "\n".join(f"    {sentence(rng, 6)}" for _ in range(rng.randint(2, 10)))
+    return f"```\n{body}\n```"
+
+
+BLOCKS = {
+    "paragraph": paragraph,
+    "links": link_paragraph,
+    "heading": heading,
+    "unordered_list": unordered_list,
+    "ordered_list": ordered_list,
+    "quote": quote,
+    "code": code,
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in BLOCKS:
+            raise argparse.ArgumentTypeError(f"unknown block kind: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def parse_pages(value):
+    return SIZES[value] if value in SIZES else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic site corpus")
+    parser.add_argument("root")
+    parser.add_argument("--pages", type=parse_pages, default="small")
+    parser.add_argument("--mix", type=parse_mix, default=None)
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--long-every", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_corpus(
+        args.root, args.pages, args.mix, args.blocks, args.long_every, args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from async_pipeline import generate_pages_async
+from copy_content import copy_content
+from corpus import SIZES, generate_corpus, parse_mix, parse_pages
+from generate_page import find_pages, generate_pages_recursive
+from page_template import PageTemplate
+from markdown_to_html import markdown_to_html
+from markdown_to_html_node import markdown_to_html_node
+from text_to_textnodes import text_to_textnodes
+
+
+def measure(func, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(name, samples, units):
+    median = statistics.median(samples)
+    stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+    return {
+        "name": name,
+        "median": median,
+        "stdev": stdev,
+        "min": min(samples),
+        "max": max(samples),
+        "units": units,
+        "units_per_sec": units / median if median > 0 else 0.0,
+    }
+
+
+def quietly(func):
+    def run():
+        with redirect_stdout(io.StringIO()):
+            func()
+
+    return run
+
+
+def run_benchmarks(root, repeat, jobs):
+    pages = find_pages(os.path.join(root, "content"), os.path.join(root, "docs"))
+    sources = []
+    for from_path, _ in pages:
+        with open(from_path) as file:
+            sources.append(file.read())
+    paragraphs = [
+        block.replace("\n", " ")
+        for source in sources
+        for block in source.split("\n\n")
+        if block and block[0] not in "#-`>0123456789"
+    ]
+    trees = [markdown_to_html_node(source) for source in sources]
+    docs = os.path.join(root, "docs")
+
+    def clean_docs():
+        shutil.rmtree(docs, ignore_errors=True)
+
+    def parse_all():
+        for source in sources:
+            markdown_to_html_node(source)
+
+    def render_all():
+        for source in sources:
+            markdown_to_html(source)
+
+    def tokenize_all():
+        for paragraph in paragraphs:
+            text_to_textnodes(paragraph)
+
+    def serialize_all():
+        for tree in trees:
+            tree.to_html()
+
+    def build_all():
+        generate_pages_recursive(
+            "/",
+            os.path.join(root, "content"),
+            os.path.join(root, "template.html"),
+            docs,
+            jobs=jobs,
+        )
+
+    def build_all_async():
+        template = PageTemplate.load(os.path.join(root, "template.html"), "/")
+        generate_pages_async(
+            "/", find_pages(os.path.join(root, "content"), docs), template, jobs=jobs
+        )
+
+    def copy_all():
+        copy_content(root, "static", "docs")
+
+    return [
+        summarize("markdown_to_html_node", measure(parse_all, repeat), len(sources)),
+        summarize("markdown_to_html", measure(render_all, repeat), len(sources)),
+        summarize("text_to_textnodes", measure(tokenize_all, repeat), len(paragraphs)),
+        summarize("ParentNode.to_html", measure(serialize_all, repeat), len(trees)),
+        summarize(
+            "generate_pages_recursive",
+            measure(quietly(build_all), repeat, setup=clean_docs),
+            len(pages),
+        ),
+        summarize(
+            "generate_pages_async",
+            measure(quietly(build_all_async), repeat, setup=clean_docs),
+            len(pages),
+        ),
+        summarize(
+            "copy_content",
+            measure(quietly(copy_all), repeat, setup=clean_docs),
+            len(os.listdir(os.path.join(root, "static", "images"))) + 1,
+        ),
+    ]
+
+
+def format_results(results):
+    lines = [
+        f"{'benchmark':<26} {'median':>11} {'stdev':>10} {'spread':>8} {'units/s':>12}"
+    ]
+    for result in results:
+        spread = result["stdev"] / result["median"] * 100 if result["median"] else 0
+        lines.append(
+            f"{result['name']:<26} {result['median'] * 1e3:>9.2f}ms "
+            f"{result['stdev'] * 1e3:>8.2f}ms {spread:>7.1f}% "
+            f"{result['units_per_sec']:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site generator")
+    parser.add_argument(
+        "--pages",
+        type=parse_pages,
+        default="medium",
+        help=f"page count or one of {', '.join(SIZES)}",
+    )
+    parser.add_argument("--mix", type=parse_mix, default=None)
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--long-every", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--json", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_corpus(
+            root, args.pages, args.mix, args.blocks, args.long_every, args.seed
+        )
+        results = run_benchmarks(root, args.repeat, args.jobs)
+
+    print(f"{args.pages} pages, {args.repeat} runs each")
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"pages": args.pages, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
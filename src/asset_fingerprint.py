@@ -0,0 +1,60 @@
+import os
+
+from build_manifest import hash_file
+from copy_content import walk_files
+from page_template import remove_if_exists, write_parts
+
+FINGERPRINTED = (
+    ".css",
+    ".js",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".svg",
+    ".webp",
+    ".avif",
+    ".woff",
+    ".woff2",
+)
+HASH_LENGTH = 8
+HEADERS_FILE = "_headers"
+IMMUTABLE = "Cache-Control: public, max-age=31536000, immutable"
+
+
+def fingerprint_assets(static_dir, manifest):
+    fingerprints = {}
+    if os.path.isdir(static_dir):
+        for rel_path in walk_files(static_dir):
+            if not rel_path.lower().endswith(FINGERPRINTED):
+                continue
+            path = os.path.join(static_dir, rel_path)
+            stat = os.stat(path)
+            stamp = [stat.st_size, stat.st_mtime_ns]
+            entry = manifest.fingerprints.get(rel_path)
+            if entry is None or entry["stamp"] != stamp:
+                entry = {"hash": hash_file(path), "stamp": stamp}
+            fingerprints[rel_path] = entry
+    manifest.fingerprints = fingerprints
+    return {
+        rel_path: fingerprinted_path(rel_path, entry["hash"])
+        for rel_path, entry in fingerprints.items()
+    }
+
+
+def fingerprinted_path(rel_path, digest):
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def write_headers(dest_dir, asset_map, basepath):
+    path = os.path.join(dest_dir, HEADERS_FILE)
+    if not asset_map:
+        remove_if_exists(path)
+        return False
+    headers = "".join(
+        f"{basepath}{fingerprinted}\n  {IMMUTABLE}\n"
+        for fingerprinted in sorted(asset_map.values())
+    )
+    os.makedirs(dest_dir, exist_ok=True)
+    return write_parts(path, [headers.encode("utf-8")])
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import io
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from extract_title import extract_title
+from dependency_graph import DependencyGraph
+from generate_page import hash_inputs, record_page_inputs, scan_page_dir
+from markdown_to_html import markdown_to_html
+from page_template import write_parts
+
+READERS = 8
+WRITERS = 8
+QUEUE_SIZE = 16
+
+
+def generate_pages_async(
+    basepath,
+    pages,
+    template,
+    manifest=None,
+    jobs=1,
+    force=False,
+    graph=None,
+    readers=READERS,
+    writers=WRITERS,
+    queue_size=QUEUE_SIZE,
+    walk=None,
+):
+    return asyncio.run(
+        run_pipeline(
+            basepath,
+            pages,
+            template,
+            manifest,
+            jobs,
+            force,
+            graph,
+            readers,
+            writers,
+            queue_size,
+            walk,
+        )
+    )
+
+
+async def run_pipeline(
+    basepath,
+    pages,
+    template,
+    manifest,
+    jobs,
+    force,
+    graph,
+    readers,
+    writers,
+    queue_size,
+    walk,
+):
+    stats = Counter(generated=0, written=0, identical=0, skipped=0, removed=0)
+    records = []
+    hashes = {template.path: template.source_hash}
+    graph = DependencyGraph() if graph is None else graph
+    paths = asyncio.Queue(queue_size)
+    sources = asyncio.Queue(queue_size)
+    outputs = asyncio.Queue(queue_size)
+    loop = asyncio.get_running_loop()
+
+    async def discover():
+        if walk is None:
+            for page in pages:
+                await paths.put(page)
+        else:
+            # Walk one directory per thread hop so that slow directory listings
+            # overlap with reading and rendering the pages already found.
+            dirs = [walk]
+            while dirs:
+                found, subdirs = await asyncio.to_thread(scan_page_dir, *dirs.pop())
+                dirs.extend(reversed(subdirs))
+                for page in found:
+                    pages.append(page)
+                    await paths.put(page)
+        for _ in range(readers):
+            await paths.put(None)
+
+    async def read():
+        while (page := await paths.get()) is not None:
+            from_path, dest_path = page
+            data = await asyncio.to_thread(read_bytes, from_path)
+            hashes[from_path] = hashlib.sha256(data).hexdigest()
+            input_paths = record_page_inputs(graph, from_path, template)
+            inputs = hash_inputs(input_paths, hashes)
+            if (
+                manifest is not None
+                and not force
+                and manifest.is_current(from_path, dest_path, inputs, basepath)
+            ):
+                stats["skipped"] += 1
+                continue
+            await sources.put((from_path, dest_path, inputs, data))
+
+    async def render(executor):
+        while (source := await sources.get()) is not None:
+            from_path, dest_path, inputs, data = source
+            print(
+                f"Generating page from {from_path} to {dest_path} "
+                f"using template {template.path}"
+            )
+            parts = await loop.run_in_executor(executor, render_page, template, data)
+            await outputs.put((from_path, dest_path, inputs, parts))
+
+    async def write():
+        while (output := await outputs.get()) is not None:
+            from_path, dest_path, inputs, parts = output
+            written = await asyncio.to_thread(write_page, dest_path, parts)
+            stats["generated"] += 1
+            stats["written" if written else "identical"] += 1
+            records.append((from_path, dest_path, inputs, basepath))
+
+    async def stage(workers, next_queue, next_workers):
+        await asyncio.gather(*workers)
+        for _ in range(next_workers):
+            await next_queue.put(None)
+
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+    renderers = max(1, jobs)
+    tasks = [
+        asyncio.create_task(discover()),
+        asyncio.create_task(
+            stage([read() for _ in range(readers)], sources, renderers)
+        ),
+        asyncio.create_task(
+            stage([render(executor) for _ in range(renderers)], outputs, writers)
+        ),
+        asyncio.create_task(stage([write() for _ in range(writers)], outputs, 0)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    if manifest is not None:
+        for record in records:
+            manifest.record(*record)
+    return stats
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def decode_source(data):
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
+def render_page(template, data):
+    markdown = decode_source(data)
+    title = extract_title(markdown)
+    return template.render_parts(title, markdown_to_html(markdown))
+
+
+def write_page(dest_path, parts):
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    return write_parts(dest_path, parts)
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+from collections import Counter, OrderedDict
+
+from markdown_to_html import RENDERER_VERSION, block_to_html
+
+DEFAULT_MAX_BLOCKS = 100000
+
+
+def block_key(block_type, lines):
+    digest = hashlib.blake2b(block_type.value.encode("utf-8"), digest_size=16)
+    for line in lines:
+        digest.update(b"\n")
+        digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BlockCache:
+    def __init__(self, path=None, max_blocks=DEFAULT_MAX_BLOCKS, blocks=None):
+        self.path = path
+        self.max_blocks = max_blocks
+        self.blocks = OrderedDict(blocks or {})
+        self.stats = Counter(hits=0, misses=0)
+        # When set to a dict, newly rendered blocks are also collected here so
+        # a pool worker can send them back to the parent's cache.
+        self.new_blocks = None
+
+    @classmethod
+    def load(cls, path, max_blocks=DEFAULT_MAX_BLOCKS):
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return cls(path, max_blocks)
+        if data.get("version") != RENDERER_VERSION:
+            return cls(path, max_blocks)
+        return cls(path, max_blocks, data.get("blocks", {}))
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"version": RENDERER_VERSION, "blocks": self.blocks}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+    def render(self, block_type, lines):
+        key = block_key(block_type, lines)
+        html = self.blocks.get(key)
+        if html is not None:
+            self.blocks.move_to_end(key)
+            self.stats["hits"] += 1
+            return html
+        self.stats["misses"] += 1
+        html = block_to_html(block_type, lines)
+        self.blocks[key] = html
+        if self.new_blocks is not None:
+            self.new_blocks[key] = html
+        if len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        return html
+
+    def merge(self, blocks, stats):
+        for key, html in blocks.items():
+            self.blocks[key] = html
+            self.blocks.move_to_end(key)
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        self.stats.update(stats)
@@ -0,0 +1,144 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import time
+from contextlib import redirect_stdout
+
+DEFAULT_SOCKET = ".sitegen.sock"
+
+
+class BuildServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, builder):
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, BuildRequestHandler)
+        self.socket_path = socket_path
+        self.builder = builder
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.connected = True
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self.send({"event": "error", "message": "Invalid request"})
+            return
+        self.send(handle_request(self.server.builder, request, self.send))
+
+    def send(self, event):
+        if not self.connected:
+            return
+        try:
+            self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        except OSError:
+            self.connected = False
+
+
+class ProgressWriter:
+    def __init__(self, send):
+        self.send = send
+        self.buffer = ""
+
+    def write(self, text):
+        lines = (self.buffer + text).split("\n")
+        self.buffer = lines.pop()
+        for line in lines:
+            self.send({"event": "progress", "message": line})
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def handle_request(builder, request, send):
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(ProgressWriter(send)):
+            stats = run_request(builder, request)
+    except Exception as e:
+        return {"event": "error", "message": str(e)}
+    elapsed = time.perf_counter() - start
+    return {"event": "done", "stats": dict(stats), "elapsed": elapsed}
+
+
+def run_request(builder, request):
+    kind = request.get("build", "full")
+    paths = [os.path.relpath(path) for path in request.get("paths", [])]
+    if kind == "full":
+        return builder.build(force=request.get("force", False))
+    if kind == "paths":
+        return builder.rebuild(expand_paths(paths), force=True)
+    if kind == "changed":
+        return builder.rebuild(paths)
+    raise ValueError(f"Unknown build request: {kind}")
+
+
+def expand_paths(paths):
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                expanded.extend(os.path.join(dirpath, name) for name in filenames)
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def remove_stale_socket(socket_path):
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except ConnectionRefusedError:
+            os.remove(socket_path)
+            return
+    raise OSError(f"A build daemon is already listening on {socket_path}")
+
+
+def serve(builder, socket_path=DEFAULT_SOCKET):
+    previous = signal.signal(signal.SIGTERM, stop_serving)
+    try:
+        with BuildServer(socket_path, builder) as server:
+            print(f"Build daemon listening on {socket_path}")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Supervisors often send SIGTERM twice; don't let the second one
+        # interrupt the manifest write.
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        try:
+            builder.save_caches()
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+
+
+def stop_serving(signum, frame):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+
+def submit(request, on_event, socket_path=DEFAULT_SOCKET):
+    if "paths" in request:
+        request = dict(request, paths=[os.path.abspath(p) for p in request["paths"]])
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as events:
+            for line in events:
+                event = json.loads(line)
+                if event["event"] == "progress":
+                    on_event(event)
+                else:
+                    return event
+    return {"event": "error", "message": "Build daemon closed the connection"}
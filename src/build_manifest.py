@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path_for(dest_dir_path):
+    parent, name = os.path.split(os.path.normpath(dest_dir_path))
+    return os.path.join(parent, f".{name}.manifest.json")
+
+
+class BuildManifest:
+    VERSION = 2
+
+    def __init__(
+        self,
+        path,
+        pages=None,
+        assets=None,
+        shard=None,
+        fingerprints=None,
+        incompressible=None,
+        sidecars=None,
+    ):
+        self.path = path
+        self.pages = pages if pages is not None else {}
+        self.assets = set(assets) if assets is not None else set()
+        self.shard = shard
+        self.fingerprints = fingerprints if fingerprints is not None else {}
+        self.incompressible = incompressible if incompressible is not None else {}
+        self.sidecars = set(sidecars) if sidecars is not None else set()
+        # False until the manifest is read from or written to disk. Without
+        # one, nothing tells us which files in the output a build owns.
+        self.saved = False
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return cls(path)
+        if data.get("version") != cls.VERSION:
+            return cls(path)
+        manifest = cls(
+            path,
+            data.get("pages", {}),
+            data.get("assets", []),
+            data.get("shard"),
+            data.get("fingerprints", {}),
+            data.get("incompressible", {}),
+            data.get("sidecars", []),
+        )
+        manifest.saved = True
+        return manifest
+
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "pages": self.pages,
+            "assets": sorted(self.assets),
+        }
+        if self.shard is not None:
+            data["shard"] = list(self.shard)
+        if self.fingerprints:
+            data["fingerprints"] = self.fingerprints
+        if self.incompressible:
+            data["incompressible"] = self.incompressible
+        if self.sidecars:
+            data["sidecars"] = sorted(self.sidecars)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.saved = True
+
+    def is_current(self, from_path, dest_path, inputs, basepath):
+        entry = self.pages.get(from_path)
+        return (
+            entry is not None
+            and entry["inputs"] == inputs
+            and entry["basepath"] == basepath
+            and entry["dest_path"] == dest_path
+            and os.path.exists(dest_path)
+        )
+
+    def record(self, from_path, dest_path, inputs, basepath):
+        self.pages[from_path] = {
+            "inputs": inputs,
+            "basepath": basepath,
+            "dest_path": dest_path,
+        }
+
+    def remove_orphans(self, sources, dest_dir_path):
+        removed = []
+        for from_path in sorted(set(self.pages) - set(sources)):
+            removed.append(self.remove_page(from_path, dest_dir_path))
+        return removed
+
+    def remove_page(self, from_path, dest_dir_path):
+        dest_path = self.pages.pop(from_path)["dest_path"]
+        if os.path.exists(dest_path):
+            print(f"Removing orphaned page {dest_path}")
+            os.remove(dest_path)
+            remove_empty_dirs(os.path.dirname(dest_path), dest_dir_path)
+        return dest_path
+
+
+def remove_empty_dirs(dir_path, root_path):
+    root_path = os.path.normpath(root_path)
+    dir_path = os.path.normpath(dir_path)
+    while dir_path != root_path and dir_path.startswith(root_path + os.sep):
+        if os.listdir(dir_path):
+            return
+        os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
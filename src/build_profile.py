@@ -0,0 +1,127 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+from extract_title import extract_title
+from markdown_to_html import render_blocks
+from page_template import write_parts
+from scan_blocks import scan_blocks
+
+STAGES = [
+    "directory walk",
+    "asset copy",
+    "read",
+    "block parse",
+    "render",
+    "template fill",
+    "write",
+    "search index",
+    "precompress",
+]
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0.0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.process_time() - cpu
+
+    def add(self, stages):
+        for name, (wall, cpu) in stages.items():
+            totals = self.stages.setdefault(name, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+
+
+def stage(timer, name):
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
+
+
+class BuildProfile:
+    def __init__(self):
+        self.totals = StageTimer()
+        self.pages = {}
+
+    def stage(self, name):
+        return self.totals.stage(name)
+
+    def add_page(self, from_path, stages):
+        self.pages[from_path] = stages
+        self.totals.add(stages)
+
+    def slowest_pages(self, count):
+        return sorted(
+            self.pages.items(),
+            key=lambda item: sum(wall for wall, _ in item[1].values()),
+            reverse=True,
+        )[:count]
+
+    def to_dict(self):
+        return {
+            "stages": format_stages(self.totals.stages),
+            "pages": {
+                from_path: format_stages(stages)
+                for from_path, stages in sorted(self.pages.items())
+            },
+        }
+
+    def save(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self, top=10):
+        lines = [f"{'stage':<20} {'wall ms':>10} {'cpu ms':>10} {'wall %':>7}"]
+        total_wall = sum(wall for wall, _ in self.totals.stages.values()) or 1.0
+        for name in STAGES:
+            if name not in self.totals.stages:
+                continue
+            wall, cpu = self.totals.stages[name]
+            lines.append(
+                f"{name:<20} {wall * 1e3:>10.2f} {cpu * 1e3:>10.2f} "
+                f"{wall / total_wall * 100:>6.1f}%"
+            )
+        if self.pages:
+            lines.append("")
+            lines.append(f"Slowest {min(top, len(self.pages))} pages:")
+            for from_path, stages in self.slowest_pages(top):
+                wall = sum(wall for wall, _ in stages.values())
+                slowest = max(stages, key=lambda name: stages[name][0])
+                lines.append(f"{wall * 1e3:>10.2f}ms  {from_path} (mostly {slowest})")
+        return "\n".join(lines)
+
+
+def format_stages(stages):
+    return {
+        name: {"wall": round(wall, 6), "cpu": round(cpu, 6)}
+        for name, (wall, cpu) in stages.items()
+    }
+
+
+def profile_page(from_path, dest_path, template):
+    timer = StageTimer()
+    with timer.stage("read"):
+        with open(from_path, "r") as file:
+            markdown_content = file.read()
+    with timer.stage("block parse"):
+        blocks = list(scan_blocks(markdown_content))
+    with timer.stage("render"):
+        parts = []
+        render_blocks(blocks, parts.append)
+        content = "".join(parts)
+    with timer.stage("template fill"):
+        title = extract_title(markdown_content)
+        parts = template.render_parts(title, content)
+    with timer.stage("write"):
+        written = write_parts(dest_path, parts)
+    return written, timer.stages
@@ -0,0 +1,218 @@
+import errno
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from build_manifest import hash_file, remove_empty_dirs
+from page_template import remove_if_exists
+
+FALLBACK_ERRORS = {
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSOCK,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+}
+LINK_ERRORS = {errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EPERM, errno.EXDEV}
+
+
+def copy_content(
+    directory,
+    src,
+    dst,
+    manifest=None,
+    checksum=False,
+    clean=False,
+    asset_map=None,
+    link=False,
+    workers=None,
+):
+    src_path = os.path.join(directory, src)
+    dst_path = os.path.join(directory, dst)
+    stats = Counter(copied=0, unchanged=0, deleted=0)
+
+    if not os.path.exists(src_path):
+        return stats
+
+    if clean and os.path.exists(dst_path):
+        print(f"Removing existing directory {dst}")
+        shutil.rmtree(dst_path)
+
+    if not os.path.exists(dst_path):
+        print(f"Creating directory {dst}")
+        os.makedirs(dst_path)
+
+    if link and os.stat(src_path).st_dev != os.stat(dst_path).st_dev:
+        print(f"Copying instead of linking, {src} and {dst} are on different devices")
+        link = False
+
+    asset_map = asset_map or {}
+    entries = [
+        (
+            os.path.join(src, rel_path),
+            os.path.join(dst, asset_map.get(rel_path, rel_path)),
+        )
+        for rel_path in walk_files(src_path)
+    ]
+    synced = {entry_dst for _, entry_dst in entries}
+
+    def sync_entry(entry):
+        entry_src, entry_dst = entry
+        return sync_file(
+            os.path.join(directory, entry_src),
+            os.path.join(directory, entry_dst),
+            checksum,
+            link,
+        )
+
+    # Most assets are small, so per-file syscall latency dominates; overlap it.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(sync_entry, entries)
+        for (entry_src, entry_dst), result in zip(entries, results):
+            if result == "copied":
+                print(f"Copying file from {entry_src} to {entry_dst}")
+            stats[result] += 1
+
+    if manifest is not None:
+        for entry_dst in sorted(manifest.assets - synced):
+            stats["deleted"] += remove_asset(directory, dst, entry_dst)
+        manifest.assets = synced
+
+    print(f"Finished copying {src} to {dst}")
+    return stats
+
+
+def sync_assets(directory, src, dst, rel_paths, manifest, checksum=False, link=False):
+    stats = Counter(copied=0, unchanged=0, deleted=0)
+    for rel_path in rel_paths:
+        entry_dst = os.path.join(dst, rel_path)
+        if os.path.isfile(os.path.join(directory, src, rel_path)):
+            result = copy_if_changed(directory, src, dst, rel_path, checksum, link=link)
+            stats[result] += 1
+            manifest.assets.add(entry_dst)
+        elif entry_dst in manifest.assets:
+            stats["deleted"] += remove_asset(directory, dst, entry_dst)
+            manifest.assets.discard(entry_dst)
+    return stats
+
+
+def copy_if_changed(
+    directory, src, dst, rel_path, checksum=False, dest_rel_path=None, link=False
+):
+    entry_src = os.path.join(src, rel_path)
+    entry_dst = os.path.join(dst, dest_rel_path or rel_path)
+    result = sync_file(
+        os.path.join(directory, entry_src),
+        os.path.join(directory, entry_dst),
+        checksum,
+        link,
+    )
+    if result == "copied":
+        print(f"Copying file from {entry_src} to {entry_dst}")
+    return result
+
+
+def sync_file(src_path, dst_path, checksum=False, link=False):
+    if is_unchanged(src_path, dst_path, checksum):
+        return "unchanged"
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    tmp_path = f"{dst_path}.tmp"
+    try:
+        if not (link and link_file(src_path, tmp_path)):
+            copy_file(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        remove_if_exists(tmp_path)
+        raise
+    return "copied"
+
+
+def link_file(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+    except FileExistsError:
+        os.remove(dst_path)
+        os.link(src_path, dst_path)
+    except OSError as e:
+        if e.errno not in LINK_ERRORS:
+            raise
+        return False
+    return True
+
+
+def copy_file(src_path, dst_path):
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        src_stat = os.fstat(src.fileno())
+        offset = 0
+        for copy_range in [copy_file_range, sendfile]:
+            try:
+                while offset < src_stat.st_size:
+                    copied = copy_range(
+                        src.fileno(), dst.fileno(), offset, src_stat.st_size - offset
+                    )
+                    if copied == 0:
+                        break
+                    offset += copied
+                break
+            except OSError as e:
+                if e.errno not in FALLBACK_ERRORS:
+                    raise
+        else:
+            src.seek(offset)
+            dst.seek(offset)
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+        os.utime(dst.fileno(), ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+
+def copy_file_range(src_fd, dst_fd, offset, count):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+
+
+def sendfile(src_fd, dst_fd, offset, count):
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile is not available")
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+def remove_asset(directory, dst, entry_dst):
+    full_dst = os.path.join(directory, entry_dst)
+    if not os.path.isfile(full_dst):
+        return 0
+    print(f"Removing orphaned file {entry_dst}")
+    os.remove(full_dst)
+    remove_empty_dirs(os.path.dirname(full_dst), os.path.join(directory, dst))
+    return 1
+
+
+def walk_files(root_path, rel_dir=""):
+    files = []
+    with os.scandir(os.path.join(root_path, rel_dir)) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            rel_path = os.path.join(rel_dir, entry.name)
+            if entry.is_dir():
+                files.extend(walk_files(root_path, rel_path))
+            else:
+                files.append(rel_path)
+    return files
+
+
+def is_unchanged(src_path, dst_path, checksum=False):
+    try:
+        dst_stat = os.stat(dst_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    if checksum and hash_file(src_path) == hash_file(dst_path):
+        os.utime(dst_path, ns=(dst_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return True
+    return False
@@ -0,0 +1,44 @@
+PAGE = "page"
+ASSET = "asset"
+
+
+class DependencyGraph:
+    def __init__(self):
+        self.dependents = {}
+        self.inputs = {}
+        self.rules = []
+
+    def add(self, target, input_paths):
+        self.remove(target)
+        self.inputs[target] = list(input_paths)
+        for path in self.inputs[target]:
+            self.dependents.setdefault(path, set()).add(target)
+
+    def remove(self, target):
+        for path in self.inputs.pop(target, []):
+            dependents = self.dependents[path]
+            dependents.discard(target)
+            if not dependents:
+                del self.dependents[path]
+
+    def inputs_of(self, target):
+        return self.inputs.get(target, [])
+
+    def targets(self, kind):
+        return sorted(target for target in self.inputs if target[0] == kind)
+
+    def add_rule(self, target_for):
+        self.rules.append(target_for)
+
+    def affected(self, changed_paths):
+        targets = set()
+        for path in changed_paths:
+            if path in self.dependents:
+                targets |= self.dependents[path]
+                continue
+            for target_for in self.rules:
+                target = target_for(path)
+                if target is not None:
+                    targets.add(target)
+                    break
+        return targets
@@ -1,11 +1,27 @@
 import re
 
+from textnode import TextType
+
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
+
 
 def extract_markdown_images(text):
-    pattern = r"!\[(.*?)\]\((.*?)\)"
-    return re.findall(pattern, text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[(.*?)\]\((.*?)\)"
-    return re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
+
+
+def find_markdown_images_and_links(text, start=0, end=None):
+    if end is None:
+        end = len(text)
+    pos = start
+    for image in IMAGE_PATTERN.finditer(text, start, end):
+        for link in LINK_PATTERN.finditer(text, pos, image.start()):
+            yield TextType.LINK, link
+        yield TextType.IMAGE, image
+        pos = image.end()
+    for link in LINK_PATTERN.finditer(text, pos, end):
+        yield TextType.LINK, link
@@ -1,5 +1,8 @@
 def extract_title(markdown):
-    lines = markdown.split("\n")
+    return extract_title_lines(markdown.split("\n"))
+
+
+def extract_title_lines(lines):
     for line in lines:
         if line.startswith("# "):
             return line[2:].strip()
@@ -0,0 +1,58 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+TEMPLATE = "<title>{{ Title }}</title>{{ Content }}"
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def path(self, path):
+        return os.path.join(self.root, path)
+
+    def write(self, path, text):
+        path = self.path(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="") as file:
+            file.write(text)
+
+    def read(self, path):
+        with open(self.path(path)) as file:
+            return file.read()
+
+    def read_tree(self, dest):
+        dest = self.path(dest)
+        tree = {}
+        for dirpath, _, filenames in os.walk(dest):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, "rb") as file:
+                    tree[os.path.relpath(path, dest)] = file.read()
+        return tree
+
+    def run_quietly(self, func, *args, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+
+
+class SiteTestCase(TempDirTestCase):
+    files = {
+        "template.html": TEMPLATE,
+        "content/index.md": "# Home\n\nWelcome",
+        "content/blog/index.md": "# Blog\n\nPosts",
+        "static/index.css": "body {}",
+    }
+
+    def setUp(self):
+        super().setUp()
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        for path, text in self.files.items():
+            self.write(path, text)
@@ -1,42 +1,229 @@
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from extract_title import extract_title
-from markdown_to_html_node import markdown_to_html_node
+from block_cache import BlockCache
+from build_manifest import hash_file
+from build_profile import profile_page
+from dependency_graph import PAGE, DependencyGraph
+from extract_title import extract_title, extract_title_lines
+from markdown_to_html import markdown_to_html, render_blocks
+from page_template import PageTemplate
+from scan_blocks import read_lines, scan_block_lines
 
 
-def generate_page(basepath, from_path, template_path, dest_path):
+def generate_page(
+    basepath,
+    from_path,
+    template_path,
+    dest_path,
+    template=None,
+    profile=False,
+    cache=None,
+    block_cache=None,
+):
     print(
         f"Generating page from {from_path} to {dest_path} using template {template_path}"
     )
 
-    markdown_content = ""
-    template_content = ""
+    if template is None:
+        template = PageTemplate.load(template_path, basepath)
+    if profile:
+        return profile_page(from_path, dest_path, template)
+
+    if cache is None:
+        return generate_page_stream(from_path, dest_path, template, block_cache)
 
     with open(from_path, "r") as file:
         markdown_content = file.read()
-    with open(template_path, "r") as file:
-        template_content = file.read()
 
-    content = markdown_to_html_node(markdown_content).to_html()
-    title = extract_title(markdown_content)
+    cached = cache.get(markdown_content)
+    if cached is None:
+        title = extract_title(markdown_content)
+        content = markdown_to_html(markdown_content, block_cache)
+        cache.put(markdown_content, title, content)
+    else:
+        title, content = cached
+    return template.write(dest_path, title, content), None
 
-    final_html = (
-        template_content.replace("{{ Title }}", title)
-        .replace("{{ Content }}", content)
-        .replace('href="/', f'href="{basepath}')
-        .replace('src="/', f'src="{basepath}')
-    )
 
-    with open(dest_path, "w") as file:
-        file.write(final_html)
+def generate_page_stream(from_path, dest_path, template, block_cache=None):
+    with open(from_path, "r") as file:
+        title = extract_title_lines(read_lines(file))
+        file.seek(0)
+        blocks = scan_block_lines(read_lines(file))
+        written = template.write_stream(
+            dest_path, title, partial(render_blocks, blocks, block_cache=block_cache)
+        )
+    return written, None
+
+
+def generate_pages_recursive(
+    basepath,
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    manifest=None,
+    jobs=1,
+    force=False,
+):
+    pages = find_pages(dir_path_content, dest_dir_path)
+    template = PageTemplate.load(template_path, basepath)
+    stats = generate_pages(basepath, pages, template, manifest, jobs, force)
+    if manifest is not None:
+        sources = [from_path for from_path, _ in pages]
+        stats["removed"] = len(manifest.remove_orphans(sources, dest_dir_path))
+    return stats
+
+
+def generate_pages(
+    basepath,
+    pages,
+    template,
+    manifest=None,
+    jobs=1,
+    force=False,
+    profile=None,
+    cache=None,
+    block_cache=None,
+    graph=None,
+):
+    stats = Counter(generated=0, written=0, identical=0, skipped=0, removed=0)
+    stale = []
+    records = []
+    hashes = {template.path: template.source_hash}
+    graph = DependencyGraph() if graph is None else graph
+    for from_path, dest_path in pages:
+        input_paths = record_page_inputs(graph, from_path, template)
+        if manifest is not None:
+            inputs = hash_inputs(input_paths, hashes)
+            if not force and manifest.is_current(
+                from_path, dest_path, inputs, basepath
+            ):
+                stats["skipped"] += 1
+                continue
+            records.append((from_path, dest_path, inputs, basepath))
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        stale.append(
+            (
+                basepath,
+                from_path,
+                template.path,
+                dest_path,
+                template,
+                bool(profile),
+                cache,
+            )
+        )
+
+    if jobs > 1 and len(stale) > 1:
+        jobs = min(jobs, len(stale))
+        chunksize = max(1, len(stale) // (jobs * 4))
+        # The block cache is too large to ship per job, so each worker gets a
+        # copy once and sends back only the blocks it rendered.
+        initargs = (None, 0)
+        if block_cache is not None:
+            initargs = (block_cache.blocks, block_cache.max_blocks)
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=init_worker, initargs=initargs
+        ) as pool:
+            results = list(
+                pool.map(generate_page_worker_job, stale, chunksize=chunksize)
+            )
+        for _, _, cache_stats, block_results in results:
+            if cache is not None:
+                cache.stats.update(cache_stats)
+            if block_cache is not None:
+                block_cache.merge(*block_results)
+    else:
+        results = [generate_page_job(job + (block_cache,)) for job in stale]
+
+    for job, (written, stages, *_) in zip(stale, results):
+        stats["written" if written else "identical"] += 1
+        if profile is not None:
+            profile.add_page(job[1], stages)
+
+    for record in records:
+        manifest.record(*record)
+    stats["generated"] = len(stale)
+    return stats
+
+
+def record_page_inputs(graph, from_path, template):
+    target = (PAGE, from_path)
+    input_paths = [from_path, template.path]
+    # Keep any extra edges (partials, data files) added with graph.add().
+    input_paths += [
+        path for path in graph.inputs_of(target) if path not in input_paths
+    ]
+    graph.add(target, input_paths)
+    return input_paths
+
 
+def hash_inputs(input_paths, hashes):
+    for path in input_paths:
+        if path not in hashes:
+            hashes[path] = hash_file(path)
+    return {path: hashes[path] for path in input_paths}
 
-def generate_pages_recursive(basepath, dir_path_content, template_path, dest_dir_path):
-    for entry in os.listdir(dir_path_content):
+
+def generate_page_job(job):
+    cache = job[6]
+    if cache is None:
+        return *generate_page(*job), None
+    before = Counter(cache.stats)
+    written, stages = generate_page(*job)
+    return written, stages, cache.stats - before
+
+
+worker_block_cache = None
+
+
+def init_worker(blocks, max_blocks):
+    global worker_block_cache
+    if blocks is not None:
+        worker_block_cache = BlockCache(max_blocks=max_blocks, blocks=blocks)
+        worker_block_cache.new_blocks = {}
+
+
+def generate_page_worker_job(job):
+    block_cache = worker_block_cache
+    if block_cache is None:
+        return *generate_page_job(job + (None,)), None
+    before = Counter(block_cache.stats)
+    result = generate_page_job(job + (block_cache,))
+    new_blocks = block_cache.new_blocks
+    block_cache.new_blocks = {}
+    return *result, (new_blocks, block_cache.stats - before)
+
+
+def find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for entry in sorted(os.listdir(dir_path_content)):
         from_path = os.path.join(dir_path_content, entry)
         dest_path = os.path.join(dest_dir_path, entry.replace(".md", ".html"))
         if os.path.isfile(from_path) and entry.endswith(".md"):
-            generate_page(basepath, from_path, template_path, dest_path)
+            pages.append((from_path, dest_path))
         elif os.path.isdir(from_path):
-            os.makedirs(dest_path, exist_ok=True)
-            generate_pages_recursive(basepath, from_path, template_path, dest_path)
+            pages.extend(find_pages(from_path, dest_path))
+    return pages
+
+
+def scan_page_dir(dir_path_content, dest_dir_path):
+    pages = []
+    subdirs = []
+    with os.scandir(dir_path_content) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            dest_path = os.path.join(dest_dir_path, entry.name.replace(".md", ".html"))
+            if entry.is_file() and entry.name.endswith(".md"):
+                pages.append((entry.path, dest_path))
+            elif entry.is_dir():
+                subdirs.append((entry.path, dest_path))
+    return pages, subdirs
+
+
+def dest_path_for(from_path, dir_path_content, dest_dir_path):
+    rel_path = os.path.relpath(from_path, dir_path_content)
+    entries = [entry.replace(".md", ".html") for entry in rel_path.split(os.sep)]
+    return os.path.join(dest_dir_path, *entries)
@@ -1,4 +1,6 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,6 +10,12 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("Subclasses should implement this method")
 
+    def write_html(self, fp):
+        self.render_html(fp.write)
+
+    def render_html(self, write):
+        write(self.to_html())
+
     def props_to_html(self):
         if not self.props:
             return ""
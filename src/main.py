@@ -1,45 +1,355 @@
+import argparse
 import os
-import shutil
 import sys
+import time
 
-from generate_page import generate_pages_recursive
+from block_cache import BlockCache
+from build_daemon import DEFAULT_SOCKET, serve, submit
+from build_profile import BuildProfile
+from dev_server import start_server
+from render_cache import RenderCache
+from shard_build import find_shard_dirs, merge_shards
+from site_builder import SiteBuilder
+from watch import POLL_INTERVAL, watch
 
 
 def main():
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-    
-    copy_content(os.getcwd(), "static", "docs")
-    
-    generate_pages_recursive(basepath, "content", "template.html", "docs")
-
-
-def copy_content(directory, src, dst):
-    src_path = os.path.join(directory, src)
-    dst_path = os.path.join(directory, dst)
-
-    if not os.path.exists(src_path):
-        return
-
-    if os.path.exists(dst_path):
-        print(f"Removing existing directory {dst}")
-        shutil.rmtree(dst_path)
-
-    print(f"Creating directory {dst}")
-    os.mkdir(dst_path)
-
-    entries = os.listdir(src_path)
-    for entry in entries:
-        entry_src = os.path.join(src, entry)
-        entry_dst = os.path.join(dst, entry)
-        full_src = os.path.join(src_path, entry)
-        full_dst = os.path.join(dst_path, entry)
-        if os.path.isdir(full_src):
-            copy_content(directory, entry_src, entry_dst)
+    argv = sys.argv[1:]
+    if argv[:1] == ["client"]:
+        sys.exit(run_client(parse_client_args(argv[1:])))
+    if argv[:1] == ["merge"]:
+        sys.exit(run_merge(parse_merge_args(argv[1:])))
+    daemon = argv[:1] == ["daemon"]
+    args = parse_args(argv[1:] if daemon else argv)
+
+    profile = BuildProfile() if args.profile else None
+    cache = None
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    block_cache = None
+    if args.block_cache:
+        if args.cache_dir:
+            block_cache = BlockCache.load(os.path.join(args.cache_dir, "blocks.json"))
         else:
-            print(f"Copying file from {entry_src} to {entry_dst}")
-            shutil.copy(full_src, full_dst)
+            block_cache = BlockCache()
+    builder = SiteBuilder(
+        args.basepath,
+        jobs=args.jobs,
+        checksum=args.checksum,
+        profile=profile,
+        cache=cache,
+        block_cache=block_cache,
+        pipeline=args.pipeline,
+        shard=args.shard,
+        compress=args.precompress,
+        fingerprint=args.fingerprint,
+        link_assets=args.link_assets,
+        search=args.search_index,
+    )
+
+    start = time.perf_counter()
+    stats = builder.build(force=args.force, clean=args.clean)
+    elapsed = time.perf_counter() - start
+
+    rate = stats["generated"] / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Copied {stats['copied']} assets, "
+        f"{stats['unchanged']} unchanged, {stats['deleted']} deleted"
+    )
+    print(
+        f"Generated {stats['generated']} pages: {stats['written']} written, "
+        f"{stats['skipped'] + stats['identical']} unchanged, "
+        f"{stats['removed']} deleted "
+        f"in {elapsed:.2f}s ({rate:.1f} pages/sec, {args.jobs} jobs)"
+    )
+    if args.precompress:
+        print(
+            f"Precompressed {stats['compressed']} files, "
+            f"{stats['compressed_unchanged']} unchanged, "
+            f"{stats['incompressible']} incompressible, "
+            f"{stats['compressed_removed']} deleted, "
+            f"saving {stats['bytes_saved']} bytes"
+        )
+    if args.search_index:
+        print(
+            f"Search index: {stats['indexed']} pages indexed, "
+            f"{stats['unindexed']} removed, {stats['shards']} shards written"
+        )
+    if cache is not None:
+        print(
+            f"Render cache: {cache.stats['hits']} hits, "
+            f"{cache.stats['misses']} misses, {cache.stats['evicted']} evicted"
+        )
+    if block_cache is not None:
+        print(
+            f"Block cache: {block_cache.stats['hits']} hits, "
+            f"{block_cache.stats['misses']} misses"
+        )
+
+    if profile is not None:
+        print(profile.report(args.profile_top))
+        profile.save(args.profile_output)
+        print(f"Wrote profile to {args.profile_output}")
+        builder.profile = None
+
+    if daemon:
+        serve(builder, args.socket)
+    elif args.watch:
+        start_server(builder.dest_dir, args.port)
+        watch_site(builder, args.poll_interval)
+
+
+def watch_site(builder, poll_interval):
+    def on_change(changed_paths):
+        start = time.perf_counter()
+        try:
+            stats = builder.rebuild(changed_paths)
+        except Exception as e:
+            print(f"Rebuild failed: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"Rebuilt {stats['generated']} pages and {stats['copied']} assets "
+            f"for {len(changed_paths)} changed files in {elapsed:.1f}ms"
+        )
+
+    print("Watching for changes, press Ctrl+C to stop")
+    try:
+        watch(
+            [builder.content_dir, builder.static_dir, builder.template_path],
+            on_change,
+            poll_interval,
+        )
+    except KeyboardInterrupt:
+        builder.save_caches()
+
+
+def run_client(args):
+    request = {"build": args.mode, "force": args.force}
+    if args.mode != "full":
+        request["paths"] = args.paths
+    try:
+        event = submit(request, lambda event: print(event["message"]), args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No build daemon listening on {args.socket}")
+        return 1
+    if event["event"] == "error":
+        print(f"Build failed: {event['message']}")
+        return 1
+    stats = event["stats"]
+    print(
+        f"Built in {event['elapsed'] * 1000:.1f}ms: "
+        f"{stats.get('written', 0)} pages written, "
+        f"{stats.get('copied', 0)} assets copied, "
+        f"{stats.get('removed', 0) + stats.get('deleted', 0)} files deleted"
+    )
+    return 0
+
+
+def run_merge(args):
+    shard_dirs = args.shards or find_shard_dirs(args.dest)
+    try:
+        stats = merge_shards(shard_dirs, args.dest, args.content, args.search_index)
+    except ValueError as e:
+        print(f"Merge failed: {e}")
+        return 1
+    print(
+        f"Merged {len(shard_dirs)} shards into {args.dest}: {stats['pages']} pages, "
+        f"{stats['copied']} files copied, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed"
+    )
+    return 0
+
+
+def parse_merge_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py merge", description="Merge sharded build outputs"
+    )
+    parser.add_argument(
+        "shards",
+        nargs="*",
+        help="shard output directories, by default every docs-shard-I-of-N",
+    )
+    parser.add_argument("--dest", default="docs", help="merged output directory")
+    parser.add_argument(
+        "--content",
+        default="content",
+        help="content directory checked for pages missing from every shard",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="update the search index in the merged output",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_client_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py client", description="Submit a build to the build daemon"
+    )
+    parser.add_argument(
+        "mode",
+        choices=["full", "paths", "changed"],
+        help="build everything, the pages and assets under paths, or changed files",
+    )
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore the build manifest for a full build",
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help="Unix socket of the build daemon",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate the static site")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore the build manifest and regenerate every page",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="remove the output directory before building",
+    )
+    parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="compare asset contents when sizes match but mtimes differ",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory of the render cache, keyed by markdown content hash",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=positive_int,
+        default=256,
+        help="size bound of the render cache in MB, least recently used first out",
+    )
+    parser.add_argument(
+        "--block-cache",
+        action="store_true",
+        help="reuse rendered blocks across builds, kept in --cache-dir if given",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="write a full-text search index sharded by term prefix to search/",
+    )
+    parser.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="hardlink static files into the output instead of copying them",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="copy CSS, JS, images and fonts under content-hashed names "
+        "and rewrite references to them",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz sidecars of HTML, CSS, SVG and JS outputs",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each build stage per page and in aggregate",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=positive_int,
+        default=10,
+        help="number of slowest pages listed by --profile",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="build-profile.json",
+        help="path of the JSON report written by --profile",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve the output and rebuild changed pages and assets",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8888,
+        help="port for the development server used by --watch",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=positive_float,
+        default=POLL_INTERVAL,
+        help="seconds between scans for changes in --watch mode",
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=["sync", "async"],
+        default="sync",
+        help="render pages one by one, or overlap reads and writes with rendering",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard,
+        help="build only shard I of N (as I/N) into docs-shard-I-of-N",
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help="Unix socket the build daemon listens on",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes used to render pages",
+    )
+    args = parser.parse_args(argv)
+    uses_caches = args.cache_dir or args.block_cache
+    if args.pipeline == "async" and (args.profile or uses_caches):
+        parser.error("--pipeline async does not support --profile or the caches")
+    if args.profile and uses_caches:
+        parser.error("--profile does not support --cache-dir or --block-cache")
+    if args.shard and args.watch:
+        parser.error("--shard cannot be combined with --watch")
+    return args
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {value}")
+    return number
+
 
-    print(f"Finished copying {src} to {dst}")
+def shard(value):
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {value}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"expected 1 <= I <= N, got {value}")
+    return index, count
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+from block_type import BlockType
+from scan_blocks import scan_blocks
+from scan_inline import scan_inline
+from textnode import TextType
+
+RENDERER_VERSION = 1
+
+
+def markdown_to_html(markdown, block_cache=None):
+    parts = []
+    render_markdown(markdown, parts.append, block_cache)
+    return "".join(parts)
+
+
+def render_markdown(markdown, write, block_cache=None):
+    render_blocks(scan_blocks(markdown), write, block_cache)
+
+
+def render_blocks(blocks, write, block_cache=None):
+    render = block_to_html if block_cache is None else block_cache.render
+    write("<div>")
+    for block_type, lines in blocks:
+        write(render(block_type, lines))
+    write("</div>")
+
+
+def block_to_html(block_type, lines):
+    match block_type:
+        case BlockType.PARAGRAPH:
+            text = " ".join(lines)
+            return f"<p>{text_to_html(text)}</p>"
+
+        case BlockType.HEADING:
+            sections = "\n".join(lines).split(" ", 1)
+            level = len(sections[0])
+            text = sections[1]
+            return f"<h{level}>{text_to_html(text)}</h{level}>"
+
+        case BlockType.CODE:
+            text = "\n".join(lines).replace("```", "").lstrip()
+            return f"<pre><code>{text}</code></pre>"
+
+        case BlockType.QUOTE:
+            text = " ".join(line[1:].strip() for line in lines)
+            return f"<blockquote>{text_to_html(text)}</blockquote>"
+
+        case BlockType.UNORDERED_LIST:
+            items = "".join(
+                f"<li>{text_to_html(line[2:].strip())}</li>" for line in lines
+            )
+            return f"<ul>{items}</ul>"
+
+        case BlockType.ORDERED_LIST:
+            items = "".join(
+                f"<li>{text_to_html(line[len(str(i + 1)) + 2 :].strip())}</li>"
+                for i, line in enumerate(lines)
+            )
+            return f"<ol>{items}</ol>"
+
+
+def text_to_html(text):
+    return "".join(token_to_html(*token) for token in scan_inline(text))
+
+
+def token_to_html(text, text_type, url):
+    if text_type == TextType.TEXT:
+        return text
+    elif text_type == TextType.BOLD:
+        return f"<b>{text}</b>"
+    elif text_type == TextType.ITALIC:
+        return f"<i>{text}</i>"
+    elif text_type == TextType.CODE:
+        return f"<code>{text}</code>"
+    elif text_type == TextType.LINK:
+        return f'<a href="{url}">{text}</a>'
+    elif text_type == TextType.IMAGE:
+        return f'<img src="{url}" alt="{text}"></img>'
+    else:
+        raise Exception(f"Unsupported TextType: {text_type}")
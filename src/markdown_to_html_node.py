@@ -1,72 +1,67 @@
 from block_type import BlockType
-from block_to_block_type import block_to_block_type
 from leafnode import LeafNode
-from markdown_to_blocks import markdown_to_blocks
 from parentnode import ParentNode
+from scan_blocks import scan_blocks
 from text_to_textnodes import text_to_textnodes
 from textnode import TextNode, TextType
 from textnode_to_htmlnode import text_node_to_html_node
 
 
 def markdown_to_html_node(markdown):
-    if not markdown.strip():
-        return LeafNode("div", "")
-        
-    blocks = markdown_to_blocks(markdown)
-    block_nodes = []
+    return blocks_to_html_node(scan_blocks(markdown))
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        node = None
 
-        match block_type:
-            case BlockType.PARAGRAPH:
-                text = block.replace("\n", " ")
-                children = text_to_children(text)
-                node = ParentNode("p", children)
+def blocks_to_html_node(blocks):
+    block_nodes = [
+        block_to_html_node(block_type, lines) for block_type, lines in blocks
+    ]
+    if not block_nodes:
+        return LeafNode("div", "")
+    return ParentNode("div", block_nodes)
 
-            case BlockType.HEADING:
-                sections = block.split(" ", 1)
-                level = len(sections[0])
-                text = sections[1]
-                children = text_to_children(text)
-                node = ParentNode(f"h{level}", children)
 
-            case BlockType.CODE:
-                text = block.replace("```", "").lstrip()
-                text_node = TextNode(text, TextType.CODE)
-                children = [text_node_to_html_node(text_node)]
-                node = ParentNode("pre", children)
+def block_to_html_node(block_type, lines):
+    match block_type:
+        case BlockType.PARAGRAPH:
+            text = " ".join(lines)
+            children = text_to_children(text)
+            return ParentNode("p", children)
 
-            case BlockType.QUOTE:
-                lines = block.split("\n")
-                text = " ".join(line.replace(">", "", 1).strip() for line in lines)
-                children = text_to_children(text)
-                node = ParentNode("blockquote", children)
+        case BlockType.HEADING:
+            sections = "\n".join(lines).split(" ", 1)
+            level = len(sections[0])
+            text = sections[1]
+            children = text_to_children(text)
+            return ParentNode(f"h{level}", children)
 
-            case BlockType.UNORDERED_LIST:
-                lines = block.split("\n")
-                list_children = []
-                for line in lines:
-                    text = line.replace("- ", "", 1).strip()
-                    children = text_to_children(text)
-                    li_node = ParentNode("li", children)
-                    list_children.append(li_node)
-                node = ParentNode("ul", list_children)
+        case BlockType.CODE:
+            text = "\n".join(lines).replace("```", "").lstrip()
+            text_node = TextNode(text, TextType.CODE)
+            children = [text_node_to_html_node(text_node)]
+            return ParentNode("pre", children)
 
-            case BlockType.ORDERED_LIST:
-                lines = block.split("\n")
-                list_children = []
-                for i, line in enumerate(lines):
-                    text = line.replace(f"{i+1}. ", "", 1).strip()
-                    children = text_to_children(text)
-                    li_node = ParentNode("li", children)
-                    list_children.append(li_node)
-                node = ParentNode("ol", list_children)
+        case BlockType.QUOTE:
+            text = " ".join(line[1:].strip() for line in lines)
+            children = text_to_children(text)
+            return ParentNode("blockquote", children)
 
-        block_nodes.append(node)
+        case BlockType.UNORDERED_LIST:
+            list_children = []
+            for line in lines:
+                text = line[2:].strip()
+                children = text_to_children(text)
+                li_node = ParentNode("li", children)
+                list_children.append(li_node)
+            return ParentNode("ul", list_children)
 
-    return ParentNode("div", block_nodes)
+        case BlockType.ORDERED_LIST:
+            list_children = []
+            for i, line in enumerate(lines):
+                text = line[len(str(i + 1)) + 2 :].strip()
+                children = text_to_children(text)
+                li_node = ParentNode("li", children)
+                list_children.append(li_node)
+            return ParentNode("ol", list_children)
 
 
 def text_to_children(text):
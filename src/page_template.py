@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+
+from build_manifest import hash_file
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+URL_ATTRIBUTES = ('href="', 'src="')
+URL_PATTERN = re.compile(r'(href|src)="/([^"?#]*)')
+
+
+class PageTemplate:
+    def __init__(
+        self, segments, basepath, path=None, source_hash=None, asset_map=None
+    ):
+        self.segments = segments
+        self.basepath = basepath
+        self.path = path
+        self.source_hash = source_hash
+        self.asset_map = asset_map
+
+    @classmethod
+    def load(cls, template_path, basepath, asset_map=None):
+        with open(template_path, "r", encoding="utf-8") as file:
+            template = cls.compile(file.read(), basepath, asset_map)
+        template.path = template_path
+        template.source_hash = hash_file(template_path)
+        if asset_map:
+            assets = json.dumps(asset_map, sort_keys=True)
+            template.source_hash = hashlib.sha256(
+                f"{template.source_hash}{assets}".encode("utf-8")
+            ).hexdigest()
+        return template
+
+    @classmethod
+    def compile(cls, template_content, basepath, asset_map=None):
+        segments = []
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(template_content):
+            static = rewrite_urls(
+                template_content[pos : match.start()], basepath, asset_map
+            )
+            segments.append(static.encode("utf-8"))
+            segments.append((match.group(1), static.endswith(URL_ATTRIBUTES)))
+            pos = match.end()
+        static = rewrite_urls(template_content[pos:], basepath, asset_map)
+        segments.append(static.encode("utf-8"))
+        return cls(segments, basepath, asset_map=asset_map)
+
+    def render_parts(self, title, content):
+        values = {"Title": title, "Content": content}
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, bytes):
+                parts.append(segment)
+            else:
+                parts.append(self.render_value(segment, values[segment[0]]))
+        return parts
+
+    def render_value(self, segment, value):
+        _, after_url_attribute = segment
+        value = rewrite_urls(value, self.basepath, self.asset_map)
+        if after_url_attribute and value.startswith("/"):
+            value = asset_url(value[1:], self.basepath, self.asset_map)
+        return value.encode("utf-8")
+
+    def render(self, title, content):
+        return b"".join(self.render_parts(title, content))
+
+    def write(self, dest_path, title, content):
+        return write_parts(dest_path, self.render_parts(title, content))
+
+    def write_stream(self, dest_path, title, render):
+        tmp_path = f"{dest_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                self.stream(file, title, render)
+            if same_contents(tmp_path, dest_path):
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            remove_if_exists(tmp_path)
+            raise
+        return True
+
+    def stream(self, file, title, render):
+        write_fragment = self.fragment_writer(file)
+        for segment in self.segments:
+            if isinstance(segment, bytes):
+                file.write(segment)
+            elif segment[0] == "Title":
+                file.write(self.render_value(segment, title))
+            else:
+                render(write_fragment)
+
+    def fragment_writer(self, file):
+        basepath = self.basepath
+        asset_map = self.asset_map
+
+        def write_fragment(fragment):
+            file.write(rewrite_urls(fragment, basepath, asset_map).encode("utf-8"))
+
+        return write_fragment
+
+
+def rewrite_urls(html, basepath, asset_map=None):
+    if not asset_map:
+        return rewrite_basepath(html, basepath)
+    return URL_PATTERN.sub(
+        lambda match: f'{match[1]}="{asset_url(match[2], basepath, asset_map)}', html
+    )
+
+
+def asset_url(path, basepath, asset_map=None):
+    if asset_map:
+        path = asset_map.get(path, path)
+    return basepath + path
+
+
+def rewrite_basepath(html, basepath):
+    if basepath == "/":
+        return html
+    return html.replace('href="/', f'href="{basepath}').replace(
+        'src="/', f'src="{basepath}'
+    )
+
+
+def write_parts(dest_path, parts):
+    total = sum(len(part) for part in parts)
+    if matches_parts(dest_path, parts, total):
+        return False
+    tmp_path = f"{dest_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            written = os.writev(file.fileno(), parts) if hasattr(os, "writev") else 0
+            if written < total:
+                file.write(memoryview(b"".join(parts))[written:])
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        remove_if_exists(tmp_path)
+        raise
+    return True
+
+
+def matches_parts(path, parts, size):
+    try:
+        if os.path.getsize(path) != size:
+            return False
+        with open(path, "rb") as file:
+            return all(file.read(len(part)) == part for part in parts)
+    except FileNotFoundError:
+        return False
+
+
+def same_contents(path, other_path):
+    try:
+        if os.path.getsize(path) != os.path.getsize(other_path):
+            return False
+        with open(path, "rb") as file, open(other_path, "rb") as other:
+            while True:
+                chunk = file.read(1 << 16)
+                if chunk != other.read(1 << 16):
+                    return False
+                if not chunk:
+                    return True
+    except FileNotFoundError:
+        return False
+
+
+def remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -2,15 +2,25 @@ from htmlnode import HTMLNode
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
-        super().__init__(tag, None, children, props)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props
     
     def to_html(self):
+        parts = []
+        self.render_html(parts.append)
+        return "".join(parts)
+
+    def render_html(self, write):
         if not self.tag:
             raise ValueError("ParentNode must have a tag to convert to HTML")
         if not self.children:
             raise ValueError("ParentNode must have children to convert to HTML")
-        children_html = ""
+        write(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
\ No newline at end of file
+            child.render_html(write)
+        write(f"</{self.tag}>")
\ No newline at end of file
@@ -0,0 +1,121 @@
+import gzip
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from build_manifest import remove_empty_dirs
+from copy_content import walk_files
+
+COMPRESSIBLE = (".html", ".css", ".svg", ".js")
+SIDECAR = ".gz"
+
+
+def precompress(dest_dir, workers=None, manifest=None, rel_paths=None):
+    stats = Counter(
+        compressed=0,
+        compressed_unchanged=0,
+        incompressible=0,
+        compressed_removed=0,
+        bytes_saved=0,
+    )
+    if not os.path.isdir(dest_dir):
+        return stats
+    if rel_paths is None:
+        rel_paths = walk_files(dest_dir)
+        sources = set(rel_paths)
+        removed = [
+            rel_path.removesuffix(SIDECAR)
+            for rel_path in rel_paths
+            if is_sidecar(rel_path) and rel_path.removesuffix(SIDECAR) not in sources
+        ]
+        skipped = {}
+        sidecars = set()
+    else:
+        rel_paths = sorted(set(rel_paths))
+        removed = [
+            rel_path
+            for rel_path in rel_paths
+            if not os.path.exists(os.path.join(dest_dir, rel_path))
+        ]
+        rel_paths = sorted(set(rel_paths) - set(removed))
+        skipped = dict(manifest.incompressible) if manifest is not None else {}
+        sidecars = set(manifest.sidecars) if manifest is not None else set()
+        for rel_path in removed + rel_paths:
+            skipped.pop(rel_path, None)
+            sidecars.discard(rel_path + SIDECAR)
+    for rel_path in removed:
+        stats["compressed_removed"] += remove_sidecar(dest_dir, rel_path)
+
+    known = manifest.incompressible if manifest is not None else {}
+    rel_paths = [rel_path for rel_path in rel_paths if rel_path.endswith(COMPRESSIBLE)]
+    paths = [os.path.join(dest_dir, rel_path) for rel_path in rel_paths]
+    stamps = [known.get(rel_path) for rel_path in rel_paths]
+    # zlib releases the GIL while compressing, so threads use every core.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(compress_file, paths, stamps)
+        for rel_path, (result, saved, stamp) in zip(rel_paths, results):
+            stats[result] += 1
+            stats["bytes_saved"] += saved
+            if result == "incompressible":
+                skipped[rel_path] = stamp
+            else:
+                sidecars.add(rel_path + SIDECAR)
+    if manifest is not None:
+        manifest.incompressible = skipped
+        manifest.sidecars = sidecars
+    return stats
+
+
+def remove_sidecars(dest_dir, manifest):
+    stats = Counter(compressed_removed=0)
+    for rel_path in sorted(manifest.sidecars):
+        stats["compressed_removed"] += remove_sidecar(
+            dest_dir, rel_path.removesuffix(SIDECAR)
+        )
+    manifest.incompressible = {}
+    manifest.sidecars = set()
+    return stats
+
+
+def remove_sidecar(dest_dir, rel_path):
+    path = os.path.join(dest_dir, rel_path + SIDECAR)
+    if not is_sidecar(rel_path + SIDECAR) or not os.path.exists(path):
+        return 0
+    print(f"Removing orphaned file {path}")
+    os.remove(path)
+    remove_empty_dirs(os.path.dirname(path), dest_dir)
+    return 1
+
+
+def is_sidecar(rel_path):
+    return rel_path.endswith(tuple(ext + SIDECAR for ext in COMPRESSIBLE))
+
+
+def compress_file(path, incompressible_stamp=None):
+    sidecar = path + SIDECAR
+    source_stat = os.stat(path)
+    stamp = [source_stat.st_size, source_stat.st_mtime_ns]
+    if stamp == incompressible_stamp:
+        return "incompressible", 0, stamp
+    try:
+        sidecar_stat = os.stat(sidecar)
+    except FileNotFoundError:
+        sidecar_stat = None
+    if sidecar_stat and sidecar_stat.st_mtime_ns == source_stat.st_mtime_ns:
+        saved = source_stat.st_size - sidecar_stat.st_size
+        return "compressed_unchanged", saved, stamp
+
+    with open(path, "rb") as file:
+        data = file.read()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data):
+        if sidecar_stat is not None:
+            os.remove(sidecar)
+        return "incompressible", 0, stamp
+
+    tmp_path = sidecar + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(compressed)
+    os.utime(tmp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    os.replace(tmp_path, sidecar)
+    return "compressed", len(data) - len(compressed), stamp
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+
+from markdown_to_html import RENDERER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SHARD_PATTERN = re.compile(r"[0-9a-f]{2}")
+
+
+class RenderCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = Counter(hits=0, misses=0, evicted=0)
+
+    def key(self, markdown):
+        digest = hashlib.sha256(f"{RENDERER_VERSION}\0".encode("utf-8"))
+        digest.update(markdown.encode("utf-8"))
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, markdown):
+        path = self.path_for(self.key(markdown))
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry["title"], entry["content"]
+
+    def put(self, markdown, title, content):
+        path = self.path_for(self.key(markdown))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"title": title, "content": content}, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.entry_paths():
+            stat = os.stat(path)
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.stats["evicted"] += 1
+        return total
+
+    def entry_paths(self):
+        # Only the key[:2] directories belong to the cache; other files in
+        # cache_dir, such as the block cache, are left alone.
+        try:
+            shards = [
+                entry.path
+                for entry in os.scandir(self.cache_dir)
+                if entry.is_dir() and SHARD_PATTERN.fullmatch(entry.name)
+            ]
+        except FileNotFoundError:
+            return []
+        return [
+            entry.path
+            for shard in sorted(shards)
+            for entry in os.scandir(shard)
+            if entry.is_file()
+        ]
@@ -0,0 +1,64 @@
+import re
+
+from block_type import BlockType
+
+HEADING_PATTERN = re.compile(r"#{1,6}\s")
+
+
+def scan_blocks(markdown):
+    return scan_block_lines(markdown.split("\n"))
+
+
+def read_lines(file):
+    for line in file:
+        yield line.removesuffix("\n")
+
+
+def scan_block_lines(lines):
+    block = []
+    for line in lines:
+        if line:
+            if block:
+                block.append(line)
+            elif not line.isspace():
+                block.append(line.lstrip())
+            continue
+        if block:
+            yield finish_block(block)
+            block = []
+    if block:
+        yield finish_block(block)
+
+
+def finish_block(lines):
+    while lines[-1].isspace():
+        lines.pop()
+    lines[-1] = lines[-1].rstrip()
+    return classify_lines(lines), lines
+
+
+def classify_lines(lines):
+    first = lines[0]
+    if HEADING_PATTERN.match(first):
+        return BlockType.HEADING
+
+    if first == "```" and len(lines) > 1 and lines[-1].endswith("```"):
+        return BlockType.CODE
+
+    quote = unordered = ordered = True
+    for number, line in enumerate(lines, 1):
+        if quote:
+            quote = line.startswith(">")
+        if unordered:
+            unordered = line.startswith("- ")
+        if ordered:
+            prefix = str(number)
+            ordered = line.startswith(prefix) and line.startswith(". ", len(prefix))
+        if not (quote or unordered or ordered):
+            return BlockType.PARAGRAPH
+
+    if quote:
+        return BlockType.QUOTE
+    if unordered:
+        return BlockType.UNORDERED_LIST
+    return BlockType.ORDERED_LIST
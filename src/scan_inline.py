@@ -0,0 +1,66 @@
+import re
+
+from extract_markdown import find_markdown_images_and_links
+from textnode import TextType
+
+DELIMITER_PATTERN = re.compile(r"`|\*\*|_")
+BOLD_DELIMITER_PATTERN = re.compile(r"`|\*\*")
+
+
+def scan_inline(text):
+    if not text:
+        return [(text, TextType.TEXT, None)]
+
+    tokens = []
+    pos = 0
+    while True:
+        match = DELIMITER_PATTERN.search(text, pos)
+        if match is None:
+            scan_images_and_links(text, pos, len(text), tokens)
+            return tokens
+        start = match.start()
+        if start > pos:
+            scan_images_and_links(text, pos, start, tokens)
+
+        delimiter = match.group()
+        if delimiter == "`":
+            end = text.find("`", start + 1)
+            if end == -1:
+                raise unmatched_delimiter(text)
+            tokens.append((text[start + 1 : end], TextType.CODE, None))
+            pos = end + 1
+        elif delimiter == "**":
+            close = BOLD_DELIMITER_PATTERN.search(text, start + 2)
+            if close is None or close.group() != "**":
+                raise unmatched_delimiter(text)
+            tokens.append((text[start + 2 : close.start()], TextType.BOLD, None))
+            pos = close.end()
+        else:
+            close = DELIMITER_PATTERN.search(text, start + 1)
+            if close is None or close.group() != "_":
+                raise unmatched_delimiter(text)
+            tokens.append((text[start + 1 : close.start()], TextType.ITALIC, None))
+            pos = close.end()
+
+
+def scan_images_and_links(text, start, end, tokens):
+    pos = start
+    if text.find("[", start, end) != -1:
+        for text_type, match in find_markdown_images_and_links(text, start, end):
+            if match.start() > pos:
+                tokens.append((text[pos : match.start()], TextType.TEXT, None))
+            tokens.append((match.group(1), text_type, match.group(2)))
+            pos = match.end()
+    if end > pos:
+        tokens.append((text[pos:end], TextType.TEXT, None))
+
+
+def unmatched_delimiter(text):
+    segments = text.split("`")
+    if len(segments) % 2 == 0:
+        delimiter = "`"
+    elif any(segment.count("**") % 2 for segment in segments[::2]):
+        delimiter = "**"
+    else:
+        delimiter = "_"
+    return ValueError(f"Invalid Markdown: unmatched delimiter '{delimiter}'")
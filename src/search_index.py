@@ -0,0 +1,223 @@
+import json
+import os
+import re
+from collections import Counter
+
+from block_type import BlockType
+from extract_title import extract_title_lines
+from build_manifest import remove_empty_dirs
+from page_template import remove_if_exists, write_parts
+from scan_blocks import read_lines, scan_block_lines
+from text_to_textnodes import text_to_textnodes
+
+SEARCH_DIR = "search"
+DOCS_FILE = "docs.json"
+PREFIX_LENGTH = 2
+MIN_TERM_LENGTH = 2
+TERM_PATTERN = re.compile(r"\w+")
+SHARD_KEY_PATTERN = re.compile(r"[^a-z0-9]")
+
+
+def search_state_path(dest_dir_path):
+    parent, name = os.path.split(os.path.normpath(dest_dir_path))
+    return os.path.join(parent, f".{name}.search.json")
+
+
+class SearchIndex:
+    VERSION = 2
+
+    def __init__(self, dest_dir, pages=None, next_id=0, shards=None):
+        self.dest_dir = os.path.normpath(dest_dir)
+        self.search_dir = os.path.join(self.dest_dir, SEARCH_DIR)
+        self.path = search_state_path(self.dest_dir)
+        self.pages = pages if pages is not None else {}
+        self.next_id = next_id
+        self.shards = set(shards) if shards is not None else set()
+
+    @classmethod
+    def load(cls, dest_dir):
+        index = cls(dest_dir)
+        try:
+            with open(index.path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        if data.get("version") == cls.VERSION:
+            index.pages = data["pages"]
+            index.next_id = data["next_id"]
+            index.shards = set(data["shards"])
+        return index
+
+    @property
+    def docs_path(self):
+        return os.path.join(self.search_dir, DOCS_FILE)
+
+    def shard_path(self, key):
+        return os.path.join(self.search_dir, f"{key}.json")
+
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "next_id": self.next_id,
+            "pages": self.pages,
+            "shards": sorted(self.shards),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file, sort_keys=True, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        # Pages and assets may live under search/ too, so only remove the files
+        # the index wrote.
+        for key in self.shards:
+            remove_if_exists(self.shard_path(key))
+        remove_if_exists(self.docs_path)
+        if os.path.isdir(self.search_dir):
+            remove_empty_dirs(self.search_dir, self.dest_dir)
+        remove_if_exists(self.path)
+        self.pages = {}
+        self.next_id = 0
+        self.shards = set()
+
+    def update(self, manifest, basepath):
+        stats = Counter(indexed=0, unindexed=0, shards=0)
+        if not self.pages or not os.path.exists(self.docs_path):
+            self.clear()
+        changes = []
+        for from_path in sorted(set(self.pages) - set(manifest.pages)):
+            page = self.pages.pop(from_path)
+            changes.append((page["id"], page["terms"], {}))
+            stats["unindexed"] += 1
+
+        for from_path, entry in sorted(manifest.pages.items()):
+            page = self.pages.get(from_path)
+            url = page_url(entry["dest_path"], self.dest_dir, basepath)
+            source_hash = entry["inputs"][from_path]
+            if page is not None and page["hash"] == source_hash:
+                page["url"] = url
+                continue
+            title, terms = index_page(from_path)
+            if page is None:
+                page = {"id": self.next_id, "terms": {}}
+                self.next_id += 1
+            changes.append((page["id"], page["terms"], terms))
+            self.pages[from_path] = dict(
+                page, hash=source_hash, url=url, title=title, terms=terms
+            )
+            stats["indexed"] += 1
+
+        os.makedirs(self.search_dir, exist_ok=True)
+        for key in sorted(changed_shard_keys(changes)):
+            stats["shards"] += self.update_shard(key, changes)
+        docs = {
+            page["id"]: [page["url"], page["title"]] for page in self.pages.values()
+        }
+        write_json(self.docs_path, {"prefix_length": PREFIX_LENGTH, "docs": docs})
+        self.save()
+        return stats
+
+    def update_shard(self, key, changes):
+        path = self.shard_path(key)
+        shard = {}
+        if key in self.shards:
+            try:
+                with open(path, "r") as file:
+                    shard = json.load(file)
+            except FileNotFoundError:
+                pass
+        postings = {
+            term: {doc_id: counts for doc_id, *counts in entries}
+            for term, entries in shard.items()
+        }
+        for doc_id, old_terms, new_terms in changes:
+            for term in old_terms:
+                if shard_key(term) == key:
+                    postings.get(term, {}).pop(doc_id, None)
+            for term, counts in new_terms.items():
+                if shard_key(term) == key:
+                    postings.setdefault(term, {})[doc_id] = counts
+        shard = {
+            term: [[doc_id, *counts] for doc_id, counts in sorted(docs.items())]
+            for term, docs in postings.items()
+            if docs
+        }
+        if not shard:
+            if key in self.shards:
+                remove_if_exists(path)
+                self.shards.discard(key)
+            return 1
+        self.shards.add(key)
+        return write_json(path, shard)
+
+
+def changed_shard_keys(changes):
+    keys = set()
+    for _, old_terms, new_terms in changes:
+        keys.update(shard_key(term) for term in old_terms)
+        keys.update(shard_key(term) for term in new_terms)
+    return keys
+
+
+def shard_key(term):
+    return SHARD_KEY_PATTERN.sub("_", term[:PREFIX_LENGTH])
+
+
+def write_json(path, data):
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return write_parts(path, [text.encode("utf-8")])
+
+
+def page_url(dest_path, dest_dir, basepath):
+    rel_path = os.path.relpath(dest_path, dest_dir).replace(os.sep, "/")
+    if rel_path == "index.html" or rel_path.endswith("/index.html"):
+        rel_path = rel_path.removesuffix("index.html")
+    return basepath + rel_path
+
+
+def index_page(from_path):
+    with open(from_path, "r") as file:
+        title = extract_title_lines(read_lines(file))
+        file.seek(0)
+        terms = page_terms(scan_block_lines(read_lines(file)))
+    return title, terms
+
+
+def page_terms(blocks):
+    headings = Counter()
+    text = Counter()
+    for block_type, lines in blocks:
+        counts = headings if block_type == BlockType.HEADING else text
+        for fragment in block_texts(block_type, lines):
+            counts.update(split_terms(fragment))
+    return {
+        term: [headings[term], text[term]]
+        for term in sorted(headings.keys() | text.keys())
+    }
+
+
+def block_texts(block_type, lines):
+    match block_type:
+        case BlockType.CODE:
+            return ["\n".join(lines).replace("```", "")]
+        case BlockType.HEADING:
+            texts = ["\n".join(lines).split(" ", 1)[1]]
+        case BlockType.QUOTE:
+            texts = [" ".join(line[1:].strip() for line in lines)]
+        case BlockType.UNORDERED_LIST:
+            texts = [line[2:].strip() for line in lines]
+        case BlockType.ORDERED_LIST:
+            texts = [
+                line[len(str(i + 1)) + 2 :].strip() for i, line in enumerate(lines)
+            ]
+        case _:
+            texts = [" ".join(lines)]
+    return [node.text for text in texts for node in text_to_textnodes(text)]
+
+
+def split_terms(text):
+    return [
+        term
+        for term in TERM_PATTERN.findall(text.lower())
+        if len(term) >= MIN_TERM_LENGTH
+    ]
@@ -0,0 +1,121 @@
+import glob
+import os
+from collections import Counter
+
+from build_manifest import BuildManifest, manifest_path_for
+from copy_content import copy_if_changed, remove_asset, walk_files
+from generate_page import dest_path_for, find_pages
+from search_index import SearchIndex
+
+
+def shard_pages(pages, index, count):
+    sizes = {from_path: os.path.getsize(from_path) for from_path, _ in pages}
+    loads = [0] * count
+    shards = [[] for _ in range(count)]
+    for page in sorted(pages, key=lambda page: (-sizes[page[0]], page[0])):
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        loads[shard] += sizes[page[0]]
+        shards[shard].append(page)
+    return sorted(shards[index - 1])
+
+
+def shard_dest_dir(dest_dir, index, count):
+    return f"{os.path.normpath(dest_dir)}-shard-{index}-of-{count}"
+
+
+def find_shard_dirs(dest_dir):
+    pattern = f"{glob.escape(os.path.normpath(dest_dir))}-shard-*-of-*"
+    return sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+
+
+def merge_shards(shard_dirs, dest_dir, content_dir, search=False):
+    shard_dirs = [os.path.normpath(shard_dir) for shard_dir in shard_dirs]
+    dest_dir = os.path.normpath(dest_dir)
+    manifests = [
+        BuildManifest.load(manifest_path_for(shard_dir)) for shard_dir in shard_dirs
+    ]
+    check_shard_set(shard_dirs, manifests)
+
+    owners = {}
+    pages = {}
+    for shard_dir, manifest in zip(shard_dirs, manifests):
+        for rel_path in walk_files(shard_dir):
+            if rel_path in owners:
+                raise ValueError(
+                    f"Shards overlap: {rel_path} is in {owners[rel_path]} "
+                    f"and {shard_dir}"
+                )
+            owners[rel_path] = shard_dir
+        for from_path, entry in manifest.pages.items():
+            if from_path in pages:
+                raise ValueError(f"Shards overlap: {from_path} was built twice")
+            output = os.path.relpath(entry["dest_path"], shard_dir)
+            if owners.get(output) != shard_dir:
+                raise ValueError(f"{shard_dir} is missing the output of {from_path}")
+            pages[from_path] = dict(
+                entry, dest_path=dest_path_for(from_path, content_dir, dest_dir)
+            )
+
+    expected = {from_path for from_path, _ in find_pages(content_dir, dest_dir)}
+    missing = sorted(expected - set(pages))
+    if missing:
+        raise ValueError(f"Shards are missing pages: {', '.join(missing)}")
+    extra = sorted(set(pages) - expected)
+    if extra:
+        raise ValueError(f"Shards contain pages not in content: {', '.join(extra)}")
+    if len({entry["basepath"] for entry in pages.values()}) > 1:
+        raise ValueError("Shards were built with different basepaths")
+    hashes = {}
+    for entry in pages.values():
+        for path, digest in entry["inputs"].items():
+            if hashes.setdefault(path, digest) != digest:
+                raise ValueError(
+                    f"Shards were built from different versions of {path}"
+                )
+
+    stats = Counter(pages=len(pages), copied=0, unchanged=0, removed=0)
+    directory = os.getcwd()
+    merged = BuildManifest.load(manifest_path_for(dest_dir))
+    if not merged.saved and os.path.isdir(dest_dir):
+        for rel_path in walk_files(dest_dir):
+            if rel_path not in owners:
+                stats["removed"] += remove_asset(
+                    directory, dest_dir, os.path.join(dest_dir, rel_path)
+                )
+    for rel_path, shard_dir in sorted(owners.items()):
+        stats[copy_if_changed(directory, shard_dir, dest_dir, rel_path)] += 1
+
+    stats["removed"] += len(merged.remove_orphans(pages, dest_dir))
+    assets = {
+        os.path.join(dest_dir, os.path.relpath(asset, shard_dir))
+        for shard_dir, manifest in zip(shard_dirs, manifests)
+        for asset in manifest.assets
+    }
+    for entry_dst in sorted(merged.assets - assets):
+        stats["removed"] += remove_asset(directory, dest_dir, entry_dst)
+    merged.pages = pages
+    merged.assets = assets
+    merged.fingerprints = next(
+        manifest.fingerprints for manifest in manifests if manifest.shard[0] == 1
+    )
+    merged.sidecars = set().union(*(manifest.sidecars for manifest in manifests))
+    merged.save()
+    if search:
+        basepath = next(iter(pages.values()))["basepath"] if pages else "/"
+        stats.update(SearchIndex.load(dest_dir).update(merged, basepath))
+    return stats
+
+
+def check_shard_set(shard_dirs, manifests):
+    if not shard_dirs:
+        raise ValueError("No shard outputs to merge")
+    shards = []
+    for shard_dir, manifest in zip(shard_dirs, manifests):
+        if manifest.shard is None:
+            raise ValueError(f"{shard_dir} has no shard manifest")
+        shards.append(tuple(manifest.shard))
+    count = shards[0][1]
+    expected = [(index, count) for index in range(1, count + 1)]
+    if sorted(shards) != expected:
+        found = ", ".join(f"{index}/{total}" for index, total in sorted(shards))
+        raise ValueError(f"Expected shards 1/{count} to {count}/{count}, found {found}")
@@ -0,0 +1,290 @@
+import os
+import shutil
+from collections import Counter
+
+from asset_fingerprint import fingerprint_assets, write_headers
+from async_pipeline import generate_pages_async
+from build_manifest import BuildManifest, manifest_path_for
+from build_profile import stage
+from copy_content import copy_content, sync_assets
+from dependency_graph import ASSET, PAGE, DependencyGraph
+from generate_page import dest_path_for, find_pages, generate_pages
+from page_template import PageTemplate
+from precompress import precompress, remove_sidecars
+from search_index import SearchIndex
+from shard_build import shard_dest_dir, shard_pages
+
+
+class SiteBuilder:
+    def __init__(
+        self,
+        basepath="/",
+        content_dir="content",
+        static_dir="static",
+        template_path="template.html",
+        dest_dir="docs",
+        jobs=1,
+        checksum=False,
+        profile=None,
+        cache=None,
+        block_cache=None,
+        pipeline="sync",
+        shard=None,
+        compress=False,
+        fingerprint=False,
+        link_assets=False,
+        search=False,
+    ):
+        self.basepath = basepath
+        self.content_dir = os.path.normpath(content_dir)
+        self.static_dir = os.path.normpath(static_dir)
+        self.template_path = os.path.normpath(template_path)
+        self.dest_dir = os.path.normpath(dest_dir)
+        if shard is not None:
+            self.dest_dir = shard_dest_dir(self.dest_dir, *shard)
+        self.jobs = jobs
+        self.checksum = checksum
+        self.profile = profile
+        self.cache = cache
+        self.block_cache = block_cache
+        self.pipeline = pipeline
+        self.shard = shard
+        self.compress = compress
+        self.fingerprint = fingerprint
+        self.link_assets = link_assets
+        self.search = search
+        self.search_index = None
+        self.asset_map = None
+        self.manifest = BuildManifest.load(manifest_path_for(self.dest_dir))
+        self.manifest.shard = shard
+        self.template = None
+        self.graph = DependencyGraph()
+        self.graph.add_rule(self.page_target)
+        self.graph.add_rule(self.asset_target)
+
+    def load_template(self):
+        self.template = PageTemplate.load(
+            self.template_path, self.basepath, self.asset_map
+        )
+        return self.template
+
+    def build(self, force=False, clean=False):
+        # The output is committed but the manifest is not, so on a fresh
+        # clone only a clean build can drop outputs of deleted sources.
+        clean = clean or not self.manifest.saved
+        with stage(self.profile, "asset copy"):
+            stats = self.copy_assets(clean)
+        stats.update(self.build_pages(force=force or clean))
+        with stage(self.profile, "search index"):
+            stats.update(self.update_search_index())
+        with stage(self.profile, "precompress"):
+            stats.update(self.compress_outputs())
+        self.save_caches()
+        if self.cache is not None:
+            self.cache.evict()
+        return stats
+
+    def page_target(self, path):
+        if is_within(path, self.content_dir) and path.endswith(".md"):
+            return PAGE, path
+        return None
+
+    def asset_target(self, path):
+        if is_within(path, self.static_dir):
+            return ASSET, os.path.relpath(path, self.static_dir)
+        return None
+
+    def record_asset(self, rel_path):
+        self.graph.add((ASSET, rel_path), [os.path.join(self.static_dir, rel_path)])
+
+    def copy_assets(self, clean=False):
+        fingerprinted = self.fingerprint or self.manifest.fingerprints
+        if self.fingerprint:
+            self.asset_map = fingerprint_assets(self.static_dir, self.manifest)
+        else:
+            self.asset_map = None
+            self.manifest.fingerprints = {}
+        if self.shard is None or self.shard[0] == 1:
+            stats = copy_content(
+                os.getcwd(),
+                self.static_dir,
+                self.dest_dir,
+                self.manifest,
+                checksum=self.checksum,
+                clean=clean,
+                asset_map=self.asset_map,
+                link=self.link_assets,
+            )
+            if fingerprinted:
+                write_headers(self.dest_dir, self.asset_map, self.basepath)
+            sources = {
+                os.path.join(self.dest_dir, dest_rel_path): rel_path
+                for rel_path, dest_rel_path in (self.asset_map or {}).items()
+            }
+            for target in self.graph.targets(ASSET):
+                self.graph.remove(target)
+            for entry_dst in self.manifest.assets:
+                rel_path = os.path.relpath(entry_dst, self.dest_dir)
+                self.record_asset(sources.get(entry_dst, rel_path))
+            return stats
+        if clean and os.path.exists(self.dest_dir):
+            print(f"Removing existing directory {self.dest_dir}")
+            shutil.rmtree(self.dest_dir)
+        return Counter(copied=0, unchanged=0, deleted=0)
+
+    def build_pages(self, force=False):
+        template = self.load_template()
+        if self.pipeline == "async" and self.shard is None:
+            pages = []
+            stats = generate_pages_async(
+                self.basepath,
+                pages,
+                template,
+                self.manifest,
+                self.jobs,
+                force,
+                self.graph,
+                walk=(self.content_dir, self.dest_dir),
+            )
+        else:
+            with stage(self.profile, "directory walk"):
+                pages = find_pages(self.content_dir, self.dest_dir)
+                if self.shard is not None:
+                    pages = shard_pages(pages, *self.shard)
+            if self.pipeline == "async":
+                stats = generate_pages_async(
+                    self.basepath,
+                    pages,
+                    template,
+                    self.manifest,
+                    self.jobs,
+                    force,
+                    self.graph,
+                )
+            else:
+                stats = generate_pages(
+                    self.basepath,
+                    pages,
+                    template,
+                    self.manifest,
+                    self.jobs,
+                    force,
+                    self.profile,
+                    self.cache,
+                    self.block_cache,
+                    self.graph,
+                )
+        sources = [from_path for from_path, _ in pages]
+        found = set(sources)
+        for target in self.graph.targets(PAGE):
+            if target[1] not in found:
+                self.graph.remove(target)
+        stats["removed"] = len(self.manifest.remove_orphans(sources, self.dest_dir))
+        return stats
+
+    def rebuild(self, changed_paths, force=False):
+        if self.shard is not None:
+            # Any size change can move pages between shards, so re-run the
+            # incremental build, which reshards and skips unchanged pages.
+            return self.build(force=force)
+        changed = {os.path.normpath(path) for path in changed_paths}
+        stats = Counter()
+        # The rel paths of every output written or removed, or None when a
+        # full pass touched outputs we don't track here.
+        outputs = []
+
+        if self.template is None:
+            stats.update(self.build_pages())
+            outputs = None
+        elif self.template_path in changed:
+            self.load_template()
+
+        targets = self.graph.affected(changed)
+        if self.fingerprint and any(kind == ASSET for kind, _ in targets):
+            asset_map = self.asset_map
+            stats.update(self.copy_assets())
+            outputs = None
+            if self.asset_map != asset_map:
+                self.load_template()
+                targets |= self.graph.affected([self.template_path])
+
+        pages = []
+        assets = []
+        removed = []
+        for kind, key in sorted(targets):
+            if kind == ASSET:
+                if self.fingerprint:
+                    continue
+                assets.append(key)
+                if os.path.isfile(os.path.join(self.static_dir, key)):
+                    self.record_asset(key)
+                else:
+                    self.graph.remove((ASSET, key))
+            elif os.path.isfile(key):
+                pages.append((key, dest_path_for(key, self.content_dir, self.dest_dir)))
+            else:
+                self.graph.remove((PAGE, key))
+                if key in self.manifest.pages:
+                    dest_path = self.manifest.remove_page(key, self.dest_dir)
+                    removed.append(dest_path)
+                    stats["removed"] += 1
+
+        stats.update(
+            sync_assets(
+                os.getcwd(),
+                self.static_dir,
+                self.dest_dir,
+                assets,
+                self.manifest,
+                self.checksum,
+                self.link_assets,
+            )
+        )
+        stats.update(
+            generate_pages(
+                self.basepath,
+                pages,
+                self.template,
+                self.manifest,
+                self.jobs,
+                force,
+                cache=self.cache,
+                block_cache=self.block_cache,
+                graph=self.graph,
+            )
+        )
+        stats.update(self.update_search_index())
+        if outputs is not None:
+            outputs.extend(assets)
+            outputs.extend(
+                os.path.relpath(dest_path, self.dest_dir)
+                for dest_path in removed + [dest_path for _, dest_path in pages]
+            )
+        stats.update(self.compress_outputs(outputs))
+        self.save_caches()
+        return stats
+
+    def update_search_index(self):
+        if self.shard is not None:
+            return Counter()
+        if self.search_index is None:
+            self.search_index = SearchIndex.load(self.dest_dir)
+        if not self.search:
+            if self.search_index.pages:
+                self.search_index.clear()
+            return Counter()
+        return self.search_index.update(self.manifest, self.basepath)
+
+    def compress_outputs(self, rel_paths=None):
+        if not self.compress:
+            return remove_sidecars(self.dest_dir, self.manifest)
+        return precompress(self.dest_dir, manifest=self.manifest, rel_paths=rel_paths)
+
+    def save_caches(self):
+        self.manifest.save()
+        if self.block_cache is not None:
+            self.block_cache.save()
+
+
+def is_within(path, dir_path):
+    return path.startswith(dir_path + os.sep)
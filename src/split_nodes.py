@@ -1,4 +1,4 @@
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from extract_markdown import IMAGE_PATTERN, LINK_PATTERN
 from textnode import TextNode, TextType
 
 
@@ -21,43 +21,26 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 
 def split_nodes_image(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-        images = extract_markdown_images(node.text)
-        if not images:
-            new_nodes.append(node)
-            continue
-        curr_text = node.text
-        for (alt_text, url) in images:
-            sections = curr_text.split(f"![{alt_text}]({url})", 1)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url=url))
-            curr_text = sections[1]
-        if curr_text:
-            new_nodes.append(TextNode(curr_text, TextType.TEXT))
-    return new_nodes
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+def split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        links = extract_markdown_links(node.text)
-        if not links:
+        text = node.text
+        pos = 0
+        for match in pattern.finditer(text):
+            if match.start() > pos:
+                new_nodes.append(TextNode(text[pos : match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, url=match.group(2)))
+            pos = match.end()
+        if pos == 0:
             new_nodes.append(node)
-            continue
-        curr_text = node.text
-        for (alt_text, url) in links:
-            sections = curr_text.split(f"[{alt_text}]({url})", 1)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(alt_text, TextType.LINK, url=url))            
-            curr_text = sections[1]
-        if curr_text:
-            new_nodes.append(TextNode(curr_text, TextType.TEXT))
-    return new_nodes
\ No newline at end of file
+        elif pos < len(text):
+            new_nodes.append(TextNode(text[pos:], TextType.TEXT))
+    return new_nodes
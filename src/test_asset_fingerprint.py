@@ -0,0 +1,73 @@
+import os
+import unittest
+from unittest import mock
+
+from asset_fingerprint import (
+    IMMUTABLE,
+    fingerprint_assets,
+    fingerprinted_path,
+    write_headers,
+)
+from build_manifest import BuildManifest, hash_file
+from fixtures import TempDirTestCase
+
+
+class TestAssetFingerprint(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = self.path("static")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/a.png", "png")
+        self.write("static/robots.txt", "User-agent: *")
+        self.manifest = BuildManifest(self.path("manifest.json"))
+
+    def test_fingerprinted_path(self):
+        self.assertEqual(
+            fingerprinted_path("css/index.css", "3f2a9c01d4"), "css/index.3f2a9c01.css"
+        )
+
+    def test_maps_hashed_names(self):
+        asset_map = fingerprint_assets(self.static, self.manifest)
+
+        digest = hash_file(os.path.join(self.static, "index.css"))
+        self.assertEqual(
+            asset_map,
+            {
+                "images/a.png": fingerprinted_path(
+                    "images/a.png", hash_file(os.path.join(self.static, "images/a.png"))
+                ),
+                "index.css": f"index.{digest[:8]}.css",
+            },
+        )
+        self.assertEqual(sorted(self.manifest.fingerprints), sorted(asset_map))
+
+    def test_reuses_hashes_of_unchanged_files(self):
+        first = fingerprint_assets(self.static, self.manifest)
+        with mock.patch("asset_fingerprint.hash_file") as hash_file_mock:
+            self.assertEqual(fingerprint_assets(self.static, self.manifest), first)
+        hash_file_mock.assert_not_called()
+
+        self.write("static/index.css", "body { color: red; }")
+        second = fingerprint_assets(self.static, self.manifest)
+        self.assertNotEqual(second["index.css"], first["index.css"])
+        self.assertEqual(second["images/a.png"], first["images/a.png"])
+
+    def test_write_headers(self):
+        dest = self.path("docs")
+        asset_map = {"index.css": "index.1.css", "images/a.png": "images/a.2.png"}
+
+        self.assertTrue(write_headers(dest, asset_map, "/site/"))
+        self.assertFalse(write_headers(dest, asset_map, "/site/"))
+        with open(os.path.join(dest, "_headers")) as file:
+            self.assertEqual(
+                file.read(),
+                f"/site/images/a.2.png\n  {IMMUTABLE}\n"
+                f"/site/index.1.css\n  {IMMUTABLE}\n",
+            )
+
+        write_headers(dest, {}, "/site/")
+        self.assertFalse(os.path.exists(os.path.join(dest, "_headers")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import unittest
+from unittest import mock
+
+import async_pipeline
+from async_pipeline import decode_source, generate_pages_async
+from build_manifest import BuildManifest
+from fixtures import TempDirTestCase
+from generate_page import find_pages, generate_pages
+from page_template import PageTemplate
+
+TEMPLATE = '<title>{{ Title }}</title><a href="/">{{ Content }}</a>'
+
+
+class TestAsyncPipeline(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        for i in range(12):
+            self.write(
+                os.path.join(self.content, f"post{i}", "index.md"),
+                f"# Post {i}\r\n\r\nSee [home](/) and **bold**\n\n- a\n- b",
+            )
+        self.template = PageTemplate.compile(TEMPLATE, "/site/")
+        self.template.source_hash = "template"
+
+    def build(self, func, dest, **kwargs):
+        pages = find_pages(self.content, dest)
+        return self.run_quietly(func, "/site/", pages, self.template, **kwargs)
+
+    def test_output_matches_sync_pipeline(self):
+        sync_dest = os.path.join(self.root, "sync")
+        async_dest = os.path.join(self.root, "async")
+        self.build(generate_pages, sync_dest)
+        stats = self.build(
+            generate_pages_async, async_dest, readers=3, writers=2, queue_size=2
+        )
+        self.assertEqual(stats["generated"], 12)
+        self.assertEqual(stats["written"], 12)
+        self.assertEqual(self.read_tree(sync_dest), self.read_tree(async_dest))
+
+    def test_process_pool_render(self):
+        sync_dest = os.path.join(self.root, "sync")
+        async_dest = os.path.join(self.root, "async")
+        self.build(generate_pages, sync_dest)
+        self.build(generate_pages_async, async_dest, jobs=2)
+        self.assertEqual(self.read_tree(sync_dest), self.read_tree(async_dest))
+
+    def test_walk_discovers_pages_inside_pipeline(self):
+        self.write(os.path.join(self.content, "post3", "notes.txt"), "not a page")
+        sync_dest = os.path.join(self.root, "sync")
+        async_dest = os.path.join(self.root, "async")
+        self.build(generate_pages, sync_dest)
+        pages = []
+        stats = self.run_quietly(
+            generate_pages_async,
+            "/site/",
+            pages,
+            self.template,
+            walk=(self.content, async_dest),
+        )
+        self.assertEqual(stats["generated"], 12)
+        self.assertEqual(pages, find_pages(self.content, async_dest))
+        self.assertEqual(self.read_tree(sync_dest), self.read_tree(async_dest))
+
+    def test_manifest_skips_current_pages(self):
+        dest = os.path.join(self.root, "docs")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        self.build(generate_pages_async, dest, manifest=manifest)
+        self.write(os.path.join(self.content, "post3", "index.md"), "# Changed")
+
+        stats = self.build(generate_pages_async, dest, manifest=manifest)
+
+        self.assertEqual(stats["generated"], 1)
+        self.assertEqual(stats["skipped"], 11)
+        stats = self.build(generate_pages, dest, manifest=manifest)
+        self.assertEqual(stats["skipped"], 12)
+
+    def test_error_stops_pipeline(self):
+        self.write(os.path.join(self.content, "broken", "index.md"), "no title")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        with self.assertRaises(ValueError):
+            self.build(
+                generate_pages_async,
+                os.path.join(self.root, "docs"),
+                manifest=manifest,
+                queue_size=1,
+            )
+        self.assertEqual(manifest.pages, {})
+
+    def test_queues_bound_pages_in_flight(self):
+        reads = []
+        pending = []
+        read_bytes = async_pipeline.read_bytes
+
+        def counting_read(path):
+            reads.append(path)
+            return read_bytes(path)
+
+        def counting_write(dest_path, parts):
+            pending.append(len(reads) - len(pending))
+
+        with mock.patch.object(async_pipeline, "read_bytes", counting_read):
+            with mock.patch.object(async_pipeline, "write_page", counting_write):
+                self.build(
+                    generate_pages_async,
+                    os.path.join(self.root, "docs"),
+                    readers=2,
+                    writers=1,
+                    queue_size=2,
+                )
+        self.assertEqual(len(reads), 12)
+        # two readers, two queues of two, one renderer and one writer
+        self.assertLessEqual(max(pending), 2 + 2 + 1 + 2 + 1)
+
+    def test_decode_source_matches_text_mode(self):
+        self.assertEqual(decode_source(b"# a\r\nb\rc\n"), "# a\nb\nc\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import block_cache as block_cache_module
+from block_cache import BlockCache, block_key
+from block_type import BlockType
+from generate_page import generate_pages
+from markdown_to_html import markdown_to_html
+from page_template import PageTemplate
+
+PAGE = """# Changelog
+
+## 1.2.0
+
+Added **bold** things and a [link](https://example.com).
+
+1. first
+2. second
+
+- item
+- other
+
+```
+code block
+```
+
+> quoted _text_
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_matches_uncached_render(self):
+        cache = BlockCache()
+        self.assertEqual(markdown_to_html(PAGE, cache), markdown_to_html(PAGE))
+        self.assertEqual(markdown_to_html(PAGE, cache), markdown_to_html(PAGE))
+
+    def test_edit_renders_only_changed_block(self):
+        cache = BlockCache()
+        markdown_to_html(PAGE, cache)
+        self.assertEqual(cache.stats["misses"], 7)
+
+        edited = PAGE.replace("- other", "- changed")
+        html = markdown_to_html(edited, cache)
+
+        self.assertEqual(html, markdown_to_html(edited))
+        self.assertEqual(cache.stats["misses"], 8)
+        self.assertEqual(cache.stats["hits"], 6)
+
+    def test_key_depends_on_type_and_lines(self):
+        key = block_key(BlockType.PARAGRAPH, ["a", "b"])
+        self.assertNotEqual(key, block_key(BlockType.HEADING, ["a", "b"]))
+        self.assertNotEqual(key, block_key(BlockType.PARAGRAPH, ["a b"]))
+        self.assertNotEqual(key, block_key(BlockType.PARAGRAPH, ["ab"]))
+
+    def test_ordered_list_numbering_is_part_of_key(self):
+        cache = BlockCache()
+        long_list = "\n".join(f"{i}. x" for i in range(1, 11))
+        short = markdown_to_html("1. a\n2. b", cache)
+        long = markdown_to_html(long_list, cache)
+        self.assertEqual(short, "<div><ol><li>a</li><li>b</li></ol></div>")
+        self.assertEqual(long, markdown_to_html(long_list))
+        self.assertEqual(cache.stats["hits"], 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockCache(max_blocks=2)
+        markdown_to_html("a\n\nb", cache)
+        markdown_to_html("a", cache)
+        markdown_to_html("c", cache)
+        self.assertEqual(len(cache.blocks), 2)
+        self.assertIn(block_key(BlockType.PARAGRAPH, ["a"]), cache.blocks)
+        self.assertNotIn(block_key(BlockType.PARAGRAPH, ["b"]), cache.blocks)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "blocks.json")
+            cache = BlockCache(path)
+            markdown_to_html(PAGE, cache)
+            cache.save()
+
+            loaded = BlockCache.load(path)
+            markdown_to_html(PAGE, loaded)
+            self.assertEqual(loaded.stats["misses"], 0)
+            self.assertEqual(loaded.stats["hits"], 7)
+
+            with mock.patch.object(block_cache_module, "RENDERER_VERSION", 2):
+                self.assertEqual(BlockCache.load(path).blocks, {})
+
+    def test_pool_workers_fill_parent_cache(self):
+        template = PageTemplate.compile("{{ Content }}", "/")
+        cache = BlockCache()
+        markdown_to_html("# Changelog", cache)
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = []
+            for i in range(4):
+                from_path = os.path.join(tmp, f"page{i}.md")
+                with open(from_path, "w") as file:
+                    file.write(PAGE)
+                pages.append((from_path, os.path.join(tmp, "docs", f"page{i}.html")))
+            with redirect_stdout(io.StringIO()):
+                generate_pages("/", pages, template, jobs=2, block_cache=cache)
+
+        self.assertEqual(dict(cache.blocks), dict(self.rendered(PAGE)))
+        self.assertEqual(cache.stats["hits"] + cache.stats["misses"], 1 + 4 * 7)
+        self.assertGreaterEqual(cache.stats["hits"], 4)
+
+    def rendered(self, markdown):
+        cache = BlockCache()
+        markdown_to_html(markdown, cache)
+        return cache.blocks
+
+    def test_load_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = BlockCache.load(os.path.join(tmp, "blocks.json"))
+            self.assertEqual(cache.blocks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import signal
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from build_daemon import BuildServer, ProgressWriter, expand_paths, serve, submit
+from fixtures import SiteTestCase
+from site_builder import SiteBuilder
+
+
+class TestBuildDaemon(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.builder = SiteBuilder()
+        self.server = BuildServer("daemon.sock", self.builder)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    def submit(self, request):
+        progress = []
+        event = submit(request, progress.append, "daemon.sock")
+        return event, [e["message"] for e in progress]
+
+    def test_full_build_streams_progress(self):
+        event, progress = self.submit({"build": "full"})
+        self.assertEqual(event["event"], "done")
+        self.assertEqual(event["stats"]["written"], 2)
+        self.assertEqual(event["stats"]["copied"], 1)
+        self.assertIn(
+            "Generating page from content/index.md to docs/index.html "
+            "using template template.html",
+            progress,
+        )
+        self.assertEqual(
+            self.read("docs/index.html"),
+            "<title>Home</title><div><h1>Home</h1><p>Welcome</p></div>",
+        )
+
+        event, _ = self.submit({"build": "full"})
+        self.assertEqual(event["stats"]["skipped"], 2)
+
+    def test_changed_files(self):
+        self.submit({"build": "full"})
+        self.write("content/blog/index.md", "# Blog\n\nNew post")
+        event, _ = self.submit({"build": "changed", "paths": ["content/blog/index.md"]})
+        self.assertEqual(event["stats"]["written"], 1)
+        self.assertIn("New post", self.read("docs/blog/index.html"))
+
+    def test_paths_regenerate_subtree(self):
+        self.submit({"build": "full"})
+        event, _ = self.submit({"build": "paths", "paths": ["content/blog"]})
+        self.assertEqual(event["stats"]["generated"], 1)
+        self.assertEqual(event["stats"]["identical"], 1)
+
+    def test_errors_are_reported(self):
+        self.write("content/broken.md", "no title")
+        event, _ = self.submit({"build": "full"})
+        self.assertEqual(
+            event, {"event": "error", "message": "No title found in markdown"}
+        )
+        event, _ = self.submit({"build": "everything"})
+        self.assertEqual(event["message"], "Unknown build request: everything")
+
+    def test_second_daemon_refuses_socket(self):
+        with self.assertRaises(OSError):
+            BuildServer("daemon.sock", self.builder)
+
+    def test_sigterm_saves_caches_once(self):
+        saves = []
+
+        def save_caches():
+            os.kill(os.getpid(), signal.SIGTERM)
+            saves.append(True)
+
+        def serve_forever(server):
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        builder = SiteBuilder()
+        with mock.patch.object(builder, "save_caches", save_caches):
+            with mock.patch.object(BuildServer, "serve_forever", serve_forever):
+                self.run_quietly(serve, builder, "other.sock")
+        self.assertEqual(saves, [True])
+        self.assertEqual(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
+        self.assertFalse(os.path.exists("other.sock"))
+
+    def test_expand_paths(self):
+        self.assertEqual(
+            sorted(expand_paths(["content", "template.html"])),
+            [
+                os.path.join("content", "blog", "index.md"),
+                os.path.join("content", "index.md"),
+                "template.html",
+            ],
+        )
+
+    def test_progress_writer_splits_lines(self):
+        events = []
+        writer = ProgressWriter(events.append)
+        with redirect_stdout(writer):
+            print("one")
+            print("two", end="")
+            print(" three")
+        self.assertEqual([event["message"] for event in events], ["one", "two three"])
+
+
+if __name__ == "__main__":
+    unittest.main()
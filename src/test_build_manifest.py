@@ -0,0 +1,120 @@
+import os
+import unittest
+
+from build_manifest import BuildManifest, hash_file, manifest_path_for
+from fixtures import TempDirTestCase
+from generate_page import find_pages, generate_pages_recursive
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+class TestBuildManifest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPost")
+
+    def build(self, manifest, basepath="/"):
+        return self.run_quietly(
+            generate_pages_recursive,
+            basepath,
+            self.content,
+            self.template,
+            self.docs,
+            manifest,
+        )
+
+    def test_manifest_path_next_to_dest(self):
+        self.assertEqual(manifest_path_for("docs"), ".docs.manifest.json")
+        self.assertEqual(
+            manifest_path_for("/site/docs/"), "/site/.docs.manifest.json"
+        )
+
+    def test_find_pages(self):
+        pages = find_pages(self.content, self.docs)
+        self.assertEqual(
+            pages,
+            [
+                (
+                    os.path.join(self.content, "blog", "index.md"),
+                    os.path.join(self.docs, "blog", "index.html"),
+                ),
+                (
+                    os.path.join(self.content, "index.md"),
+                    os.path.join(self.docs, "index.html"),
+                ),
+            ],
+        )
+
+    def test_save_and_load(self):
+        path = os.path.join(self.root, "manifest.json")
+        manifest = BuildManifest(path)
+        manifest.record("a.md", "a.html", {"a.md": "s", "template.html": "t"}, "/")
+        manifest.save()
+        self.assertEqual(BuildManifest.load(path).pages, manifest.pages)
+
+    def test_old_manifest_version_is_ignored(self):
+        path = os.path.join(self.root, "manifest.json")
+        self.write(path, '{"version": 1, "pages": {"a.md": {}}, "assets": []}')
+        self.assertEqual(BuildManifest.load(path).pages, {})
+
+    def test_load_missing_or_corrupt(self):
+        path = os.path.join(self.root, "manifest.json")
+        self.assertEqual(BuildManifest.load(path).pages, {})
+        self.write(path, "{not json")
+        self.assertEqual(BuildManifest.load(path).pages, {})
+
+    def test_unchanged_pages_are_skipped(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        stats = self.build(manifest)
+        self.assertEqual(stats["generated"], 2)
+        stats = self.build(manifest)
+        self.assertEqual(stats["generated"], 0)
+        self.assertEqual(stats["skipped"], 2)
+
+    def test_changed_source_is_regenerated(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        self.build(manifest)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        stats = self.build(manifest)
+        self.assertEqual(stats["generated"], 1)
+        with open(os.path.join(self.docs, "index.html")) as file:
+            self.assertIn("Changed", file.read())
+
+    def test_template_or_basepath_change_regenerates_all(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        self.build(manifest)
+        self.assertEqual(self.build(manifest, basepath="/site/")["generated"], 2)
+        self.write(self.template, TEMPLATE + "\n")
+        self.assertEqual(self.build(manifest, basepath="/site/")["generated"], 2)
+
+    def test_missing_output_is_regenerated(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        self.build(manifest)
+        os.remove(os.path.join(self.docs, "index.html"))
+        self.assertEqual(self.build(manifest)["generated"], 1)
+
+    def test_orphaned_outputs_are_removed(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        self.build(manifest)
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        stats = self.build(manifest)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+    def test_hash_file(self):
+        path = os.path.join(self.root, "a.txt")
+        self.write(path, "abc")
+        self.assertEqual(
+            hash_file(path),
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
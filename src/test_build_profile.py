@@ -0,0 +1,91 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from build_profile import BuildProfile, StageTimer, profile_page, stage
+from generate_page import generate_page
+from page_template import PageTemplate
+
+
+class TestBuildProfile(unittest.TestCase):
+    def test_stage_timer_accumulates(self):
+        timer = StageTimer()
+        with timer.stage("read"):
+            pass
+        with timer.stage("read"):
+            pass
+        self.assertEqual(list(timer.stages), ["read"])
+        wall, cpu = timer.stages["read"]
+        self.assertGreaterEqual(wall, 0.0)
+        self.assertGreaterEqual(cpu, 0.0)
+
+    def test_stage_without_timer(self):
+        with stage(None, "read"):
+            pass
+
+    def test_slowest_pages_and_totals(self):
+        profile = BuildProfile()
+        profile.add_page("a.md", {"read": [0.1, 0.1], "write": [0.1, 0.0]})
+        profile.add_page("b.md", {"read": [0.5, 0.4]})
+        profile.add_page("c.md", {"read": [0.3, 0.3]})
+        self.assertEqual(
+            [from_path for from_path, _ in profile.slowest_pages(2)],
+            ["b.md", "c.md"],
+        )
+        self.assertAlmostEqual(profile.totals.stages["read"][0], 0.9)
+        report = profile.report(top=1)
+        self.assertIn("read", report)
+        self.assertIn("b.md (mostly read)", report)
+        self.assertNotIn("c.md", report)
+
+    def test_report_includes_build_stages(self):
+        profile = BuildProfile()
+        for name in ["search index", "precompress"]:
+            with profile.stage(name):
+                pass
+            self.assertIn(f"\n{name} ", profile.report())
+
+    def test_json_report(self):
+        profile = BuildProfile()
+        profile.add_page("a.md", {"read": [0.25, 0.125]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profile.save(path)
+            with open(path) as file:
+                data = json.load(file)
+        self.assertEqual(data["stages"]["read"], {"wall": 0.25, "cpu": 0.125})
+        self.assertEqual(data["pages"]["a.md"]["read"], {"wall": 0.25, "cpu": 0.125})
+
+    def test_profile_page_matches_generate_page(self):
+        template = PageTemplate.compile(
+            '<title>{{ Title }}</title><a href="/">{{ Content }}</a>', "/site/"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "index.md")
+            with open(source, "w") as file:
+                file.write("# Home\n\n[about](/about) and **bold**\n\n- a\n- b")
+            profiled = os.path.join(tmp, "profiled.html")
+            streamed = os.path.join(tmp, "streamed.html")
+            written, stages = profile_page(source, profiled, template)
+            with redirect_stdout(io.StringIO()):
+                generate_page("/site/", source, "template.html", streamed, template)
+            with open(profiled, "rb") as a, open(streamed, "rb") as b:
+                self.assertEqual(a.read(), b.read())
+        self.assertTrue(written)
+        self.assertEqual(
+            list(stages),
+            [
+                "read",
+                "block parse",
+                "render",
+                "template fill",
+                "write",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import errno
+import os
+import unittest
+from contextlib import ExitStack
+from unittest import mock
+
+from build_manifest import BuildManifest
+from copy_content import copy_content, copy_file, is_unchanged
+from fixtures import TempDirTestCase
+
+
+class TestCopyContent(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest = BuildManifest(self.path("manifest.json"))
+        self.write("static/index.css", "body {}")
+        self.write("static/images/a.png", "png-a")
+
+    def sync(self, **kwargs):
+        return self.run_quietly(
+            copy_content, self.root, "static", "docs", self.manifest, **kwargs
+        )
+
+    def test_first_sync_copies_everything(self):
+        stats = self.sync()
+        self.assertEqual(stats["copied"], 2)
+        with open(self.path("docs/images/a.png")) as file:
+            self.assertEqual(file.read(), "png-a")
+        self.assertEqual(
+            sorted(self.manifest.assets),
+            [os.path.join("docs", "images", "a.png"), os.path.join("docs", "index.css")],
+        )
+
+    def test_unchanged_files_are_not_copied(self):
+        self.sync()
+        stats = self.sync()
+        self.assertEqual(stats["copied"], 0)
+        self.assertEqual(stats["unchanged"], 2)
+
+    def test_changed_file_is_copied(self):
+        self.sync()
+        self.write("static/index.css", "body { color: red }")
+        stats = self.sync()
+        self.assertEqual(stats["copied"], 1)
+        with open(self.path("docs/index.css")) as file:
+            self.assertEqual(file.read(), "body { color: red }")
+
+    def test_orphans_removed_and_generated_pages_kept(self):
+        self.sync()
+        self.write("docs/index.html", "<html></html>")
+        os.remove(self.path("static/images/a.png"))
+        stats = self.sync()
+        self.assertEqual(stats["deleted"], 1)
+        self.assertFalse(os.path.exists(self.path("docs/images")))
+        self.assertTrue(os.path.exists(self.path("docs/index.html")))
+
+    def test_clean_removes_destination(self):
+        self.sync()
+        self.write("docs/index.html", "<html></html>")
+        stats = self.sync(clean=True)
+        self.assertEqual(stats["copied"], 2)
+        self.assertFalse(os.path.exists(self.path("docs/index.html")))
+
+    def test_missing_source(self):
+        stats = self.run_quietly(copy_content, self.root, "missing", "docs")
+        self.assertEqual(sum(stats.values()), 0)
+        self.assertFalse(os.path.exists(self.path("docs")))
+
+    def test_copy_keeps_mtime(self):
+        os.utime(self.path("static/index.css"), ns=(0, 10**18))
+        self.sync()
+        self.assertEqual(os.stat(self.path("docs/index.css")).st_mtime_ns, 10**18)
+        self.assertEqual(self.sync(workers=1)["unchanged"], 2)
+
+    def test_copy_file_fallbacks(self):
+        data = os.urandom(300000)
+        with open(self.path("big.bin"), "wb") as file:
+            file.write(data)
+        unsupported = OSError(errno.ENOSYS, "unsupported")
+        patches = [
+            [],
+            ["os.copy_file_range"],
+            ["os.copy_file_range", "os.sendfile"],
+        ]
+        for targets in patches:
+            with self.subTest(unsupported=targets):
+                dst = self.path("copy.bin")
+                with patch_unsupported(targets, unsupported):
+                    copy_file(self.path("big.bin"), dst)
+                with open(dst, "rb") as file:
+                    self.assertEqual(file.read(), data)
+                self.assertTrue(is_unchanged(self.path("big.bin"), dst))
+
+    def test_link_assets(self):
+        self.sync(link=True)
+        self.assertTrue(
+            os.path.samefile(self.path("static/index.css"), self.path("docs/index.css"))
+        )
+        self.assertEqual(self.sync(link=True)["unchanged"], 2)
+
+        os.remove(self.path("static/index.css"))
+        self.write("static/index.css", "body { color: red }")
+        self.assertEqual(self.sync()["copied"], 1)
+        self.assertFalse(
+            os.path.samefile(self.path("static/index.css"), self.path("docs/index.css"))
+        )
+        with open(self.path("docs/index.css")) as file:
+            self.assertEqual(file.read(), "body { color: red }")
+
+    def test_link_falls_back_to_copy(self):
+        with mock.patch("os.link", side_effect=OSError(errno.EXDEV, "cross-device")):
+            stats = self.sync(link=True)
+        self.assertEqual(stats["copied"], 2)
+        self.assertFalse(
+            os.path.samefile(self.path("static/index.css"), self.path("docs/index.css"))
+        )
+
+    def test_is_unchanged_checksum(self):
+        self.write("a.txt", "same")
+        self.write("b.txt", "same")
+        os.utime(self.path("b.txt"), ns=(0, 0))
+        self.assertFalse(is_unchanged(self.path("a.txt"), self.path("b.txt")))
+        self.assertTrue(
+            is_unchanged(self.path("a.txt"), self.path("b.txt"), checksum=True)
+        )
+        self.assertTrue(is_unchanged(self.path("a.txt"), self.path("b.txt")))
+
+    def test_is_unchanged_size_differs(self):
+        self.write("a.txt", "same")
+        self.write("b.txt", "different")
+        self.assertFalse(
+            is_unchanged(self.path("a.txt"), self.path("b.txt"), checksum=True)
+        )
+        self.assertFalse(is_unchanged(self.path("a.txt"), self.path("missing.txt")))
+
+
+def patch_unsupported(targets, error):
+    stack = ExitStack()
+    for target in targets:
+        stack.enter_context(mock.patch(target, side_effect=error))
+    return stack
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from build_manifest import BuildManifest
+from dependency_graph import ASSET, PAGE, DependencyGraph
+from generate_page import find_pages, generate_pages
+from page_template import PageTemplate
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.add((PAGE, "a.md"), ["a.md", "template.html"])
+        self.graph.add((PAGE, "b.md"), ["b.md", "template.html"])
+        self.graph.add((ASSET, "index.css"), ["static/index.css"])
+
+    def test_template_affects_every_page(self):
+        self.assertEqual(
+            self.graph.affected(["template.html"]), {(PAGE, "a.md"), (PAGE, "b.md")}
+        )
+
+    def test_source_affects_only_its_page(self):
+        self.assertEqual(self.graph.affected(["b.md"]), {(PAGE, "b.md")})
+        self.assertEqual(
+            self.graph.affected(["static/index.css"]), {(ASSET, "index.css")}
+        )
+
+    def test_unknown_paths_use_rules(self):
+        self.graph.add_rule(lambda path: (PAGE, path) if path.endswith(".md") else None)
+        self.graph.add_rule(lambda path: (ASSET, path))
+        self.assertEqual(
+            self.graph.affected(["new.md", "logo.png", "a.md"]),
+            {(PAGE, "new.md"), (ASSET, "logo.png"), (PAGE, "a.md")},
+        )
+
+    def test_unknown_paths_without_rules_affect_nothing(self):
+        self.assertEqual(self.graph.affected(["notes.txt"]), set())
+
+    def test_add_replaces_and_remove_drops_edges(self):
+        self.graph.add((PAGE, "a.md"), ["a.md", "other.html"])
+        self.assertEqual(self.graph.affected(["template.html"]), {(PAGE, "b.md")})
+        self.assertEqual(self.graph.affected(["other.html"]), {(PAGE, "a.md")})
+
+        self.graph.remove((PAGE, "b.md"))
+        self.assertEqual(self.graph.affected(["template.html"]), set())
+        self.assertNotIn("template.html", self.graph.dependents)
+        self.assertEqual(self.graph.targets(PAGE), [(PAGE, "a.md")])
+
+    def test_new_input_kind_invalidates_manifest(self):
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            partial = os.path.join(root, "nav.html")
+            os.makedirs(content)
+            for name in ["a", "b"]:
+                with open(os.path.join(content, f"{name}.md"), "w") as file:
+                    file.write(f"# {name}")
+            with open(partial, "w") as file:
+                file.write("<nav></nav>")
+            template = PageTemplate.compile("{{ Content }}", "/")
+            template.path = "template.html"
+            template.source_hash = "t"
+            pages = find_pages(content, os.path.join(root, "docs"))
+            graph = DependencyGraph()
+            a_md = os.path.join(content, "a.md")
+            graph.add((PAGE, a_md), [a_md, template.path, partial])
+            manifest = BuildManifest(os.path.join(root, "manifest.json"))
+
+            def build():
+                with redirect_stdout(io.StringIO()):
+                    return generate_pages("/", pages, template, manifest, graph=graph)
+
+            self.assertEqual(build()["generated"], 2)
+            self.assertEqual(build()["generated"], 0)
+            with open(partial, "w") as file:
+                file.write("<nav>changed</nav>")
+            stats = build()
+            self.assertEqual((stats["generated"], stats["skipped"]), (1, 1))
+            self.assertEqual(graph.affected([partial]), {(PAGE, a_md)})
+
+
+if __name__ == "__main__":
+    unittest.main()
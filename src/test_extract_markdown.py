@@ -1,6 +1,11 @@
 import unittest
 
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from extract_markdown import (
+    extract_markdown_images,
+    extract_markdown_links,
+    find_markdown_images_and_links,
+)
+from textnode import TextType
 
 
 class TestExtractMarkdown(unittest.TestCase):
@@ -75,6 +80,37 @@ class TestExtractMarkdown(unittest.TestCase):
         self.assertListEqual([], extract_markdown_images(""))
         self.assertListEqual([], extract_markdown_links(""))
 
+    def test_find_images_and_links_in_order_with_spans(self):
+        text = "[a](1) ![b](2) [c](3)"
+        matches = [
+            (text_type, match.groups(), match.span())
+            for text_type, match in find_markdown_images_and_links(text)
+        ]
+        self.assertListEqual(
+            [
+                (TextType.LINK, ("a", "1"), (0, 6)),
+                (TextType.IMAGE, ("b", "2"), (7, 14)),
+                (TextType.LINK, ("c", "3"), (15, 21)),
+            ],
+            matches,
+        )
+
+    def test_find_images_and_links_within_range(self):
+        text = "[a](1) [b](2) [c](3)"
+        matches = [
+            match.group(1)
+            for _, match in find_markdown_images_and_links(text, 7, 13)
+        ]
+        self.assertListEqual(["b"], matches)
+
+    def test_images_take_precedence_over_links(self):
+        text = "[a ![b](c)"
+        matches = [
+            (text_type, match.groups())
+            for text_type, match in find_markdown_images_and_links(text)
+        ]
+        self.assertListEqual([(TextType.IMAGE, ("b", "c"))], matches)
+
 
 if __name__ == "__main__":
     unittest.main()
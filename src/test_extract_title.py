@@ -1,6 +1,6 @@
 import unittest
 
-from extract_title import extract_title
+from extract_title import extract_title, extract_title_lines
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -46,6 +46,11 @@ class TestExtractTitle(unittest.TestCase):
         markdown = "# Title\n\nSome content"
         self.assertEqual(extract_title(markdown), "Title")
 
+    def test_extract_title_lines_stops_at_title(self):
+        lines = iter(["intro", "# Title", "rest"])
+        self.assertEqual(extract_title_lines(lines), "Title")
+        self.assertEqual(list(lines), ["rest"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import os
+import unittest
+
+from fixtures import TempDirTestCase
+from generate_page import generate_pages_recursive
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class TestGeneratePagesRecursive(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, TEMPLATE)
+        for i in range(6):
+            self.write(
+                os.path.join(self.content, f"post{i}", "index.md"),
+                f"# Post {i}\n\nSee [home](/) and ![pic](/images/{i}.png)\n\n- **a**\n- _b_",
+            )
+
+    def build(self, dest, jobs):
+        return self.run_quietly(
+            generate_pages_recursive,
+            "/site/",
+            self.content,
+            self.template,
+            dest,
+            jobs=jobs,
+        )
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        self.assertEqual(self.build(serial, jobs=1)["generated"], 6)
+        self.assertEqual(self.build(parallel, jobs=3)["generated"], 6)
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+
+    def test_rebuild_counts_identical_pages(self):
+        dest = os.path.join(self.root, "docs")
+        first = self.build(dest, jobs=2)
+        self.assertEqual((first["written"], first["identical"]), (6, 0))
+        with open(os.path.join(self.content, "post0", "index.md"), "a") as file:
+            file.write("\n\nMore")
+        second = self.build(dest, jobs=2)
+        self.assertEqual((second["written"], second["identical"]), (1, 5))
+
+    def test_basepath_rewrite(self):
+        dest = os.path.join(self.root, "docs")
+        self.build(dest, jobs=1)
+        with open(os.path.join(dest, "post0", "index.html")) as file:
+            html = file.read()
+        self.assertEqual(
+            html,
+            '<title>Post 0</title><link href="/site/index.css"><article><div>'
+            "<h1>Post 0</h1>"
+            '<p>See <a href="/site/">home</a> and '
+            '<img src="/site/images/0.png" alt="pic"></img></p>'
+            "<ul><li><b>a</b></li><li><i>b</i></li></ul>"
+            "</div></article>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
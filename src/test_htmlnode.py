@@ -1,6 +1,8 @@
 import unittest
 
 from htmlnode import HTMLNode
+from leafnode import LeafNode
+from parentnode import ParentNode
 
 
 class TestHtmlNode(unittest.TestCase):
@@ -21,6 +23,15 @@ class TestHtmlNode(unittest.TestCase):
         self.assertEqual(parent.children, [child1, child2])
         self.assertEqual(parent.props, {"class": "container"})
 
+    def test_slots(self):
+        for node in (
+            HTMLNode(tag="div"),
+            LeafNode("b", "bold"),
+            ParentNode("p", [LeafNode(None, "text")]),
+        ):
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
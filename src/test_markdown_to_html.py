@@ -0,0 +1,99 @@
+import glob
+import os
+import random
+import unittest
+
+from markdown_to_html import markdown_to_html, render_markdown
+from markdown_to_html_node import markdown_to_html_node
+
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), "..", "content")
+
+LINE_STARTS = ["", "", "# ", "### ", "####### ", "> ", "- ", "1. ", "2. ", "```", " "]
+INLINE = ["word", " ", "**", "_", "`", "![alt](/a.png)", "[link](/b)", "[", ")", "x"]
+
+
+def outcome(func, markdown):
+    try:
+        return func(markdown)
+    except (ValueError, IndexError) as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def tree_to_html(markdown):
+    return markdown_to_html_node(markdown).to_html()
+
+
+class TestMarkdownToHtml(unittest.TestCase):
+    def assertSameHtml(self, markdown):
+        self.assertEqual(
+            outcome(markdown_to_html, markdown), outcome(tree_to_html, markdown)
+        )
+
+    def test_blocks(self):
+        md = """
+# Title with **bold**
+
+Paragraph with _italic_, `code`, a [link](/x)
+and an ![image](/i.png).
+
+> quoted **text**
+> more
+
+- one
+- _two_
+
+1. first
+2. second
+
+```
+raw **code**
+```
+"""
+        self.assertEqual(
+            markdown_to_html(md),
+            "<div><h1>Title with <b>bold</b></h1>"
+            "<p>Paragraph with <i>italic</i>, <code>code</code>, a "
+            '<a href="/x">link</a> and an <img src="/i.png" alt="image"></img>.</p>'
+            "<blockquote>quoted <b>text</b> more</blockquote>"
+            "<ul><li>one</li><li><i>two</i></li></ul>"
+            "<ol><li>first</li><li>second</li></ol>"
+            "<pre><code>raw **code**\n</code></pre></div>",
+        )
+        self.assertSameHtml(md)
+
+    def test_empty(self):
+        self.assertEqual(markdown_to_html(""), "<div></div>")
+        self.assertEqual(markdown_to_html("\n  \n"), "<div></div>")
+
+    def test_render_markdown_streams_fragments(self):
+        fragments = []
+        render_markdown("# A\n\nb", fragments.append)
+        self.assertEqual(fragments, ["<div>", "<h1>A</h1>", "<p>b</p>", "</div>"])
+
+    def test_unmatched_delimiter(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html("a **b")
+
+    def test_content_corpus(self):
+        paths = glob.glob(os.path.join(CONTENT_DIR, "**", "*.md"), recursive=True)
+        self.assertTrue(paths)
+        for path in paths:
+            with open(path) as file:
+                markdown = file.read()
+            with self.subTest(path=path):
+                self.assertSameHtml(markdown)
+
+    def test_matches_tree_renderer(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            lines = []
+            for _ in range(rng.randint(0, 8)):
+                inline = "".join(rng.choice(INLINE) for _ in range(rng.randint(0, 6)))
+                lines.append(rng.choice(LINE_STARTS) + inline)
+            markdown = "\n".join(lines)
+            with self.subTest(markdown=markdown):
+                self.assertSameHtml(markdown)
+
+
+if __name__ == "__main__":
+    unittest.main()
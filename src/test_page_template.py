@@ -0,0 +1,172 @@
+import os
+import tempfile
+import unittest
+from functools import partial
+
+from markdown_to_html import markdown_to_html, render_markdown
+from page_template import PageTemplate, rewrite_basepath, rewrite_urls
+
+MARKDOWN = "# Home\n\n[home](/) and ![a](/images/a.png)"
+
+TEMPLATE = """<html>
+<head><title>{{ Title }}</title><link href="/index.css" /></head>
+<body><article>{{ Content }}</article><script src="/app.js"></script></body>
+</html>"""
+
+
+def fail_midway(write):
+    write("<p>partial")
+    raise ValueError("render failed")
+
+
+def chained_replace(template_content, basepath, title, content):
+    return (
+        template_content.replace("{{ Title }}", title)
+        .replace("{{ Content }}", content)
+        .replace('href="/', f'href="{basepath}')
+        .replace('src="/', f'src="{basepath}')
+    )
+
+
+class TestPageTemplate(unittest.TestCase):
+    def assertMatchesChainedReplace(self, template_content, basepath, title, content):
+        template = PageTemplate.compile(template_content, basepath)
+        self.assertEqual(
+            template.render(title, content).decode("utf-8"),
+            chained_replace(template_content, basepath, title, content),
+        )
+
+    def test_root_basepath(self):
+        self.assertMatchesChainedReplace(
+            TEMPLATE, "/", "Home", '<p><a href="/blog">blog</a></p>'
+        )
+
+    def test_rewrites_static_and_dynamic_parts(self):
+        self.assertMatchesChainedReplace(
+            TEMPLATE,
+            "/site/",
+            "Home",
+            '<p><a href="/blog">blog</a><img src="/images/a.png" alt="a"></img></p>',
+        )
+
+    def test_repeated_placeholders(self):
+        self.assertMatchesChainedReplace(
+            "{{ Title }}|{{ Title }}|{{ Content }}", "/site/", "T", "C"
+        )
+
+    def test_placeholder_inside_url_attribute(self):
+        self.assertMatchesChainedReplace(
+            '<a href="{{ Title }}">x</a>{{ Content }}', "/site/", "/about", "c"
+        )
+
+    def test_no_placeholders(self):
+        self.assertMatchesChainedReplace('<a href="/">x</a>', "/site/", "T", "C")
+
+    def test_non_ascii(self):
+        self.assertMatchesChainedReplace(TEMPLATE, "/", "Café", "<p>naïve — ok</p>")
+
+    def test_rewrite_basepath(self):
+        self.assertEqual(
+            rewrite_basepath('<a href="/x"><img src="/y">', "/b/"),
+            '<a href="/b/x"><img src="/b/y">',
+        )
+
+    def test_rewrite_urls_uses_asset_map(self):
+        asset_map = {"index.css": "index.3f2a9c01.css", "a.png": "a.5e6f7a8b.png"}
+        self.assertEqual(
+            rewrite_urls(
+                '<link href="/index.css"><img src="/a.png"><a href="/blog">',
+                "/b/",
+                asset_map,
+            ),
+            '<link href="/b/index.3f2a9c01.css"><img src="/b/a.5e6f7a8b.png">'
+            '<a href="/b/blog">',
+        )
+
+    def test_asset_map_rewrites_template_and_content(self):
+        template = PageTemplate.compile(
+            TEMPLATE, "/site/", {"index.css": "index.1.css", "images/a.png": "a.2.png"}
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            template.write_stream(path, "Home", partial(render_markdown, MARKDOWN))
+            with open(path) as file:
+                html = file.read()
+        self.assertIn('<link href="/site/index.1.css" />', html)
+        self.assertIn('<img src="/site/a.2.png" alt="a">', html)
+        self.assertIn('<script src="/site/app.js">', html)
+
+    def test_asset_map_changes_source_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write(TEMPLATE)
+            hashes = {
+                PageTemplate.load(path, "/", asset_map).source_hash
+                for asset_map in [None, {"index.css": "index.1.css"}, {"a": "b"}]
+            }
+        self.assertEqual(len(hashes), 3)
+
+    def test_write(self):
+        template = PageTemplate.compile(TEMPLATE, "/site/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            template.write(path, "Home", "<p>hi</p>")
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), template.render("Home", "<p>hi</p>"))
+
+    def test_write_stream_matches_render(self):
+        template = PageTemplate.compile(TEMPLATE, "/site/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            template.write_stream(path, "Home", partial(render_markdown, MARKDOWN))
+            with open(path, "rb") as file:
+                self.assertEqual(
+                    file.read(), template.render("Home", markdown_to_html(MARKDOWN))
+                )
+
+    def test_write_stream_failure_removes_partial_output(self):
+        template = PageTemplate.compile(TEMPLATE, "/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with self.assertRaises(ValueError):
+                template.write_stream(path, "Home", fail_midway)
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_write_skips_identical_output(self):
+        template = PageTemplate.compile(TEMPLATE, "/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            self.assertTrue(template.write(path, "Home", "<p>hi</p>"))
+            os.utime(path, ns=(0, 0))
+            self.assertFalse(template.write(path, "Home", "<p>hi</p>"))
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)
+            self.assertTrue(template.write(path, "Home", "<p>ho</p>"))
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+    def test_write_stream_skips_identical_output(self):
+        render = partial(render_markdown, MARKDOWN)
+        template = PageTemplate.compile(TEMPLATE, "/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            self.assertTrue(template.write_stream(path, "Home", render))
+            os.utime(path, ns=(0, 0))
+            self.assertFalse(template.write_stream(path, "Home", render))
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)
+            self.assertTrue(template.write_stream(path, "Away", render))
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+    def test_write_failure_keeps_previous_output(self):
+        template = PageTemplate.compile(TEMPLATE, "/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            template.write(path, "Home", "<p>hi</p>")
+            with self.assertRaises(ValueError):
+                template.write_stream(path, "Home", fail_midway)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), template.render("Home", "<p>hi</p>"))
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from parentnode import ParentNode
@@ -169,6 +170,35 @@ class TestParentNode(unittest.TestCase):
         self.assertIn("<>&\"'", html)
         self.assertEqual(html, "<div><span><>&\"'</span></div>")
 
+    def test_write_html_streams_fragments(self):
+        inner = ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        parent = ParentNode("div", [inner], props={"class": "post"})
+        fp = io.StringIO()
+        parent.write_html(fp)
+        self.assertEqual(fp.getvalue(), parent.to_html())
+        self.assertEqual(
+            fp.getvalue(), '<div class="post"><p><b>bold</b> text</p></div>'
+        )
+
+    def test_render_html_fragments(self):
+        parent = ParentNode("ul", [LeafNode("li", "a"), LeafNode("li", "b")])
+        fragments = []
+        parent.render_html(fragments.append)
+        self.assertEqual(fragments, ["<ul>", "<li>a</li>", "<li>b</li>", "</ul>"])
+
+    def test_write_html_deep_tree(self):
+        node = LeafNode("span", "leaf")
+        for _ in range(200):
+            node = ParentNode("div", [node])
+        fp = io.StringIO()
+        node.write_html(fp)
+        self.assertEqual(fp.getvalue(), "<div>" * 200 + "<span>leaf</span>" + "</div>" * 200)
+
+    def test_write_html_invalid_child_raises(self):
+        parent = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            parent.write_html(io.StringIO())
+
 
 if __name__ == "__main__":
     unittest.main()
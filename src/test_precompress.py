@@ -0,0 +1,86 @@
+import gzip
+import os
+import unittest
+from unittest import mock
+
+from build_manifest import BuildManifest
+from fixtures import TempDirTestCase
+from precompress import precompress
+
+
+class TestPrecompress(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dest = self.root
+        self.write("index.html", "<p>hello</p>" * 100)
+        self.write("blog/index.css", "body { color: red; }\n" * 50)
+        self.write("tiny.js", "x")
+        self.write("logo.png", "png" * 100)
+
+    def precompress(self, manifest=None):
+        return self.run_quietly(precompress, self.dest, workers=2, manifest=manifest)
+
+    def test_writes_reproducible_sidecars(self):
+        stats = self.precompress()
+
+        self.assertEqual((stats["compressed"], stats["incompressible"]), (2, 1))
+        with open(self.path("index.html"), "rb") as file:
+            data = file.read()
+        with open(self.path("index.html.gz"), "rb") as file:
+            compressed = file.read()
+        self.assertEqual(gzip.decompress(compressed), data)
+        self.assertEqual(compressed, gzip.compress(data, compresslevel=9, mtime=0))
+        self.assertTrue(os.path.exists(self.path("blog/index.css.gz")))
+        self.assertFalse(os.path.exists(self.path("tiny.js.gz")))
+        self.assertFalse(os.path.exists(self.path("logo.png.gz")))
+        saved = os.path.getsize(self.path("index.html")) - len(compressed)
+        saved += os.path.getsize(self.path("blog/index.css"))
+        saved -= os.path.getsize(self.path("blog/index.css.gz"))
+        self.assertEqual(stats["bytes_saved"], saved)
+
+    def test_skips_unchanged_sources(self):
+        self.precompress()
+        self.write("index.html", "<p>changed</p>" * 100)
+        os.utime(self.path("index.html"), ns=(0, 10**18))
+
+        stats = self.precompress()
+
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(stats["compressed_unchanged"], 1)
+        with open(self.path("index.html.gz"), "rb") as file:
+            self.assertEqual(gzip.decompress(file.read()), b"<p>changed</p>" * 100)
+
+    def test_removes_stale_sidecars(self):
+        self.precompress()
+        os.remove(self.path("blog/index.css"))
+        self.write("index.html", "x")
+
+        stats = self.precompress()
+
+        self.assertEqual(stats["compressed_removed"], 1)
+        self.assertEqual(stats["incompressible"], 2)
+        self.assertFalse(os.path.exists(self.path("blog")))
+        self.assertFalse(os.path.exists(self.path("index.html.gz")))
+
+    def test_manifest_records_incompressible_files(self):
+        manifest = BuildManifest(self.path("manifest.json"))
+        self.precompress(manifest)
+        stat = os.stat(self.path("tiny.js"))
+        self.assertEqual(
+            manifest.incompressible, {"tiny.js": [stat.st_size, stat.st_mtime_ns]}
+        )
+
+        with mock.patch("gzip.compress", wraps=gzip.compress) as compress:
+            stats = self.precompress(manifest)
+        compress.assert_not_called()
+        self.assertEqual(stats["incompressible"], 1)
+
+        self.write("tiny.js", "y" * 1000)
+        stats = self.precompress(manifest)
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(manifest.incompressible, {})
+        self.assertTrue(os.path.exists(self.path("tiny.js.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import render_cache
+from fixtures import TempDirTestCase
+from generate_page import generate_pages
+from page_template import PageTemplate
+from render_cache import RenderCache
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+class TestRenderCache(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.path("cache")
+
+    def test_miss_then_hit(self):
+        cache = RenderCache(self.cache_dir)
+        self.assertIsNone(cache.get("# Home"))
+        cache.put("# Home", "Home", "<div><h1>Home</h1></div>")
+        self.assertEqual(cache.get("# Home"), ("Home", "<div><h1>Home</h1></div>"))
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_persists_across_instances(self):
+        RenderCache(self.cache_dir).put("# Home", "Home", "<div></div>")
+        self.assertEqual(
+            RenderCache(self.cache_dir).get("# Home"), ("Home", "<div></div>")
+        )
+
+    def test_key_includes_renderer_version(self):
+        cache = RenderCache(self.cache_dir)
+        key = cache.key("# Home")
+        with mock.patch.object(render_cache, "RENDERER_VERSION", 2):
+            self.assertNotEqual(cache.key("# Home"), key)
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = RenderCache(self.cache_dir)
+        cache.put("# Home", "Home", "<div></div>")
+        self.write(cache.path_for(cache.key("# Home")), "{not json")
+        self.assertIsNone(cache.get("# Home"))
+
+    def test_put_leaves_no_temp_files(self):
+        cache = RenderCache(self.cache_dir)
+        cache.put("# Home", "Home", "<div></div>")
+        cache.put("# Home", "Home", "<div>again</div>")
+        files = [name for _, _, names in os.walk(self.cache_dir) for name in names]
+        self.assertEqual(files, [f"{cache.key('# Home')}.json"])
+
+    def test_evict_least_recently_used(self):
+        cache = RenderCache(self.cache_dir)
+        for i, source in enumerate(["# A", "# B", "# C"]):
+            cache.put(source, source, "x" * 100)
+            path = cache.path_for(cache.key(source))
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        cache.get("# A")
+        entry_size = os.path.getsize(cache.path_for(cache.key("# A")))
+        cache.max_bytes = entry_size * 2
+
+        cache.evict()
+
+        self.assertEqual(cache.stats["evicted"], 1)
+        self.assertIsNone(cache.get("# B"))
+        self.assertIsNotNone(cache.get("# A"))
+        self.assertIsNotNone(cache.get("# C"))
+
+    def test_evict_leaves_other_files_alone(self):
+        cache = RenderCache(self.cache_dir, max_bytes=0)
+        cache.put("# A", "A", "x" * 100)
+        blocks = os.path.join(self.cache_dir, "blocks.json")
+        self.write(blocks, "{}" * 1000)
+
+        self.assertEqual(cache.evict(), 0)
+
+        self.assertEqual(cache.stats["evicted"], 1)
+        self.assertTrue(os.path.exists(blocks))
+
+    def test_generate_pages_uses_cache(self):
+        content = os.path.join(self.root, "content")
+        docs = os.path.join(self.root, "docs")
+        self.write(os.path.join(content, "index.md"), "# Home\n\nWelcome **in**")
+        pages = [(os.path.join(content, "index.md"), os.path.join(docs, "index.html"))]
+        template = PageTemplate.compile(TEMPLATE, "/")
+        cache = RenderCache(self.cache_dir)
+
+        self.run_quietly(generate_pages, "/", pages, template, cache=cache)
+        first = self.read(os.path.join(docs, "index.html"))
+        os.remove(os.path.join(docs, "index.html"))
+        with mock.patch("generate_page.markdown_to_html") as render:
+            self.run_quietly(generate_pages, "/", pages, template, cache=cache)
+            render.assert_not_called()
+
+        self.assertEqual(self.read(os.path.join(docs, "index.html")), first)
+        self.assertEqual(
+            first,
+            "<title>Home</title><article><div><h1>Home</h1>"
+            "<p>Welcome <b>in</b></p></div></article>",
+        )
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_parallel_counters_reach_parent(self):
+        content = os.path.join(self.root, "content")
+        docs = os.path.join(self.root, "docs")
+        pages = []
+        for name in ["a", "b", "c"]:
+            from_path = os.path.join(content, f"{name}.md")
+            self.write(from_path, f"# {name}")
+            pages.append((from_path, os.path.join(docs, f"{name}.html")))
+        template = PageTemplate.compile(TEMPLATE, "/")
+        cache = RenderCache(self.cache_dir)
+
+        with redirect_stdout(io.StringIO()):
+            generate_pages("/", pages, template, jobs=2, cache=cache)
+            generate_pages("/", pages, template, jobs=2, cache=cache)
+
+        self.assertEqual(cache.stats["misses"], 3)
+        self.assertEqual(cache.stats["hits"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
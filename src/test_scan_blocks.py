@@ -0,0 +1,115 @@
+import io
+import random
+import unittest
+
+from block_to_block_type import block_to_block_type
+from block_type import BlockType
+from markdown_to_blocks import markdown_to_blocks
+from scan_blocks import read_lines, scan_block_lines, scan_blocks
+
+LINES = [
+    "",
+    "",
+    " ",
+    "\t",
+    "text",
+    "  indented",
+    "# Heading",
+    "####### too deep",
+    "#nospace",
+    "```",
+    "code```",
+    "> quote",
+    ">",
+    "- item",
+    "- ",
+    "-item",
+    "1. one",
+    "2. two",
+    "3. three",
+    "1. ",
+    "10. ten",
+]
+
+
+def two_pass_blocks(markdown):
+    return [
+        (block_to_block_type(block), block.split("\n"))
+        for block in markdown_to_blocks(markdown)
+    ]
+
+
+class TestScanBlocks(unittest.TestCase):
+    def test_blocks(self):
+        md = """
+# Title
+
+Paragraph line one
+line two
+
+
+- a
+- b
+
+1. x
+2. y
+
+```
+code
+```
+"""
+        self.assertEqual(
+            list(scan_blocks(md)),
+            [
+                (BlockType.HEADING, ["# Title"]),
+                (BlockType.PARAGRAPH, ["Paragraph line one", "line two"]),
+                (BlockType.UNORDERED_LIST, ["- a", "- b"]),
+                (BlockType.ORDERED_LIST, ["1. x", "2. y"]),
+                (BlockType.CODE, ["```", "code", "```"]),
+            ],
+        )
+
+    def test_block_edges_are_stripped(self):
+        md = "  \n   first\n  middle  \nlast   \n \t\n\nnext"
+        self.assertEqual(
+            list(scan_blocks(md)),
+            [
+                (BlockType.PARAGRAPH, ["first", "  middle  ", "last"]),
+                (BlockType.PARAGRAPH, ["next"]),
+            ],
+        )
+
+    def test_empty_document(self):
+        self.assertEqual(list(scan_blocks("")), [])
+        self.assertEqual(list(scan_blocks("\n \n\n\t")), [])
+
+    def test_trailing_space_breaks_list_item(self):
+        self.assertEqual(
+            list(scan_blocks("- a\n- ")), [(BlockType.PARAGRAPH, ["- a", "-"])]
+        )
+
+    def test_matches_two_pass_pipeline(self):
+        rng = random.Random(42)
+        for _ in range(5000):
+            md = "\n".join(rng.choice(LINES) for _ in range(rng.randint(0, 10)))
+            with self.subTest(md=md):
+                self.assertEqual(list(scan_blocks(md)), two_pass_blocks(md))
+
+    def test_read_lines_matches_split(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            md = "\n".join(rng.choice(LINES) for _ in range(rng.randint(0, 10)))
+            md += rng.choice(["", "\n", "\n\n"])
+            with self.subTest(md=md):
+                lines = read_lines(io.StringIO(md))
+                self.assertEqual(list(scan_block_lines(lines)), list(scan_blocks(md)))
+
+    def test_read_lines_is_lazy(self):
+        file = io.StringIO("# Title\n\nbody\n")
+        blocks = scan_block_lines(read_lines(file))
+        self.assertEqual(next(blocks), (BlockType.HEADING, ["# Title"]))
+        self.assertEqual(file.tell(), len("# Title\n\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from scan_inline import scan_inline
+from split_nodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
+from textnode import TextNode, TextType
+
+PIECES = ["a", "b c", " ", "`", "*", "**", "_", "!", "[", "]", "(", ")", "](", "url"]
+
+
+def five_pass_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def outcome(func, text):
+    try:
+        return [(node.text, node.text_type, node.url) for node in func(text)]
+    except ValueError as e:
+        return str(e)
+
+
+class TestScanInline(unittest.TestCase):
+    def test_tokens(self):
+        text = "A **b** _i_ `c` ![img](/a.png) [link](/x)"
+        self.assertEqual(
+            scan_inline(text),
+            [
+                ("A ", TextType.TEXT, None),
+                ("b", TextType.BOLD, None),
+                (" ", TextType.TEXT, None),
+                ("i", TextType.ITALIC, None),
+                (" ", TextType.TEXT, None),
+                ("c", TextType.CODE, None),
+                (" ", TextType.TEXT, None),
+                ("img", TextType.IMAGE, "/a.png"),
+                (" ", TextType.TEXT, None),
+                ("link", TextType.LINK, "/x"),
+            ],
+        )
+
+    def test_empty_text(self):
+        self.assertEqual(scan_inline(""), [("", TextType.TEXT, None)])
+
+    def test_delimiters_inside_code_are_literal(self):
+        self.assertEqual(
+            scan_inline("`**not bold** _x_`"),
+            [("**not bold** _x_", TextType.CODE, None)],
+        )
+
+    def test_underscore_inside_bold_is_literal(self):
+        self.assertEqual(
+            scan_inline("**snake_case**"), [("snake_case", TextType.BOLD, None)]
+        )
+
+    def test_error_precedence_matches_passes(self):
+        cases = {
+            "_a `b": "`",
+            "_a **b": "**",
+            "**a `b` c**": "**",
+            "a _b": "_",
+            "**a** _b c": "_",
+        }
+        for text, delimiter in cases.items():
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError) as context:
+                    scan_inline(text)
+                self.assertEqual(
+                    str(context.exception),
+                    f"Invalid Markdown: unmatched delimiter '{delimiter}'",
+                )
+
+    def test_matches_five_pass_pipeline(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 16)))
+            with self.subTest(text=text):
+                self.assertEqual(
+                    outcome(scan_inline_nodes, text),
+                    outcome(five_pass_textnodes, text),
+                )
+
+
+def scan_inline_nodes(text):
+    return [TextNode(*token) for token in scan_inline(text)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import os
+import unittest
+
+from fixtures import SiteTestCase
+from scan_blocks import scan_blocks
+from search_index import page_terms, page_url, shard_key
+from site_builder import SiteBuilder
+
+
+class TestPageTerms(unittest.TestCase):
+    def test_headings_are_counted_separately(self):
+        markdown = (
+            "# Gandalf the Grey\n\n"
+            "Gandalf is a **wizard**, see [the wizard page](/wizards).\n\n"
+            "- a wizard\n- ![Gandalf smoking](/gandalf.png)\n\n"
+            "```\nyou_shall_not_pass()\n```"
+        )
+        self.assertEqual(
+            page_terms(scan_blocks(markdown)),
+            {
+                "gandalf": [1, 2],
+                "grey": [1, 0],
+                "is": [0, 1],
+                "page": [0, 1],
+                "see": [0, 1],
+                "smoking": [0, 1],
+                "the": [1, 1],
+                "wizard": [0, 3],
+                "you_shall_not_pass": [0, 1],
+            },
+        )
+
+    def test_shard_key(self):
+        self.assertEqual(shard_key("gandalf"), "ga")
+        self.assertEqual(shard_key("x"), "x")
+        self.assertEqual(shard_key("éowyn"), "_o")
+
+    def test_page_url(self):
+        self.assertEqual(page_url("docs/index.html", "docs", "/x/"), "/x/")
+        self.assertEqual(page_url("docs/blog/index.html", "docs", "/"), "/blog/")
+        self.assertEqual(page_url("docs/about.html", "docs", "/"), "/about.html")
+
+
+class TestSearchIndex(SiteTestCase):
+    files = {
+        "template.html": SiteTestCase.files["template.html"],
+        "content/index.md": "# Home\n\nWelcome to the shire",
+        "content/blog/index.md": "# Blog\n\nPosts about the shire",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.builder = SiteBuilder(search=True)
+
+    def read_json(self, path):
+        return json.loads(self.read(path))
+
+    def build(self, builder=None):
+        return self.run_quietly((builder or self.builder).build)
+
+    def doc_ids(self):
+        docs = self.read_json("docs/search/docs.json")["docs"]
+        return {url: int(doc_id) for doc_id, (url, _) in docs.items()}
+
+    def test_build_writes_sharded_index(self):
+        stats = self.build()
+
+        self.assertEqual(stats["indexed"], 2)
+        ids = self.doc_ids()
+        self.assertEqual(sorted(ids), ["/", "/blog/"])
+        self.assertEqual(
+            self.read_json("docs/search/sh.json"),
+            {"shire": sorted([[ids["/"], 0, 1], [ids["/blog/"], 0, 1]])},
+        )
+        self.assertEqual(
+            self.read_json("docs/search/bl.json"), {"blog": [[ids["/blog/"], 1, 0]]}
+        )
+
+    def test_only_changed_pages_and_shards_are_updated(self):
+        self.build()
+        ids = self.doc_ids()
+        mtime = os.stat("docs/search/bl.json").st_mtime_ns
+
+        self.write("content/blog/index.md", "# Blog\n\nPosts about mordor")
+        stats = self.build()
+
+        # The blog page leaves the "shire" and "the" shards and joins "mordor".
+        self.assertEqual((stats["indexed"], stats["shards"]), (1, 3))
+        self.assertEqual(self.doc_ids(), ids)
+        self.assertEqual(os.stat("docs/search/bl.json").st_mtime_ns, mtime)
+        self.assertEqual(
+            self.read_json("docs/search/sh.json"), {"shire": [[ids["/"], 0, 1]]}
+        )
+        self.assertEqual(
+            self.read_json("docs/search/mo.json"), {"mordor": [[ids["/blog/"], 0, 1]]}
+        )
+        self.assertEqual(self.build()["indexed"], 0)
+
+    def test_removed_pages_leave_the_index(self):
+        self.build()
+        os.remove("content/blog/index.md")
+
+        stats = self.build()
+
+        self.assertEqual(stats["unindexed"], 1)
+        self.assertEqual(list(self.doc_ids()), ["/"])
+        self.assertFalse(os.path.exists("docs/search/bl.json"))
+        self.assertFalse(os.path.exists("docs/search/po.json"))
+
+    def test_rebuild_updates_index(self):
+        self.build()
+        self.write("content/index.md", "# Home\n\nWelcome to rivendell")
+        stats = self.run_quietly(self.builder.rebuild, ["content/index.md"])
+        self.assertEqual(stats["indexed"], 1)
+        self.assertIn("rivendell", self.read_json("docs/search/ri.json"))
+
+    def test_missing_index_is_rebuilt(self):
+        self.build()
+        os.remove("docs/search/docs.json")
+        self.assertEqual(self.build(SiteBuilder(search=True))["indexed"], 2)
+
+    def test_disabling_search_removes_index(self):
+        self.build()
+        self.build(SiteBuilder())
+        self.assertFalse(os.path.exists("docs/search"))
+        self.assertFalse(os.path.exists(".docs.search.json"))
+
+    def test_index_leaves_site_files_under_search_alone(self):
+        self.write("content/search/index.md", "# Search\n\nFind the shire")
+        self.write("static/search/search.js", "search()")
+        self.build()
+        ids = self.doc_ids()
+        self.assertIn("/search/", ids)
+        self.assertIn(
+            [ids["/search/"], 1, 0], self.read_json("docs/search/se.json")["search"]
+        )
+
+        os.remove(".docs.search.json")
+        self.assertEqual(self.build(SiteBuilder(search=True))["indexed"], 3)
+        self.build(SiteBuilder())
+        self.assertEqual(sorted(os.listdir("docs/search")), ["index.html", "search.js"])
+
+
+if __name__ == "__main__":
+    unittest.main()
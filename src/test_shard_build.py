@@ -0,0 +1,155 @@
+import os
+import shutil
+import unittest
+
+from build_manifest import BuildManifest, manifest_path_for
+from fixtures import SiteTestCase
+from generate_page import find_pages
+from shard_build import find_shard_dirs, merge_shards, shard_dest_dir, shard_pages
+from site_builder import SiteBuilder
+
+
+class TestShardBuild(SiteTestCase):
+    files = {
+        "template.html": SiteTestCase.files["template.html"],
+        "content/index.md": "# Home",
+        "static/index.css": "body {}",
+        **{
+            f"content/post{i}/index.md": f"# Post {i}\n\n" + "x" * i * 10
+            for i in range(7)
+        },
+    }
+
+    def build(self, shard=None):
+        return self.run_quietly(SiteBuilder(shard=shard).build)
+
+    def merge(self, shard_dirs=None, dest="docs", search=False):
+        return self.run_quietly(
+            merge_shards, shard_dirs or find_shard_dirs(dest), dest, "content", search
+        )
+
+    def test_shard_pages_partition(self):
+        pages = find_pages("content", "docs")
+        shards = [shard_pages(pages, index, 3) for index in range(1, 4)]
+        self.assertEqual(sorted(sum(shards, [])), pages)
+        self.assertEqual([len(shard) for shard in shards], [3, 3, 2])
+        self.assertEqual(shards[1], shard_pages(list(reversed(pages)), 2, 3))
+        for shard in shards:
+            self.assertEqual(shard, sorted(shard))
+
+    def test_shard_pages_balances_by_size(self):
+        self.write("content/huge/index.md", "# Huge\n\n" + "x" * 10000)
+        pages = find_pages("content", "docs")
+        first, second = shard_pages(pages, 1, 2), shard_pages(pages, 2, 2)
+        self.assertEqual(first, [("content/huge/index.md", "docs/huge/index.html")])
+        self.assertEqual(len(second), 8)
+
+    def test_rebuild_keeps_pages_in_their_shard(self):
+        builders = [SiteBuilder(shard=(index, 2)) for index in (1, 2)]
+        for builder in builders:
+            self.run_quietly(builder.build)
+        page = next(
+            from_path
+            for from_path in builders[1].manifest.pages
+            if from_path not in builders[0].manifest.pages
+        )
+        self.write(page, "# Edited\n\nshard two")
+        for builder in builders:
+            self.run_quietly(builder.rebuild, [page])
+
+        self.assertNotIn(page, builders[0].manifest.pages)
+        self.assertEqual(self.merge()["pages"], 8)
+
+    def test_merge_without_manifest_removes_stale_outputs(self):
+        self.write("docs/old/index.html", "stale")
+        for index in range(1, 3):
+            self.build(shard=(index, 2))
+        stats = self.merge()
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists("docs/old"))
+        self.assertTrue(os.path.exists("docs/index.html"))
+
+    def test_merge_matches_unsharded_build(self):
+        self.build()
+        expected = self.read_tree("docs")
+        shutil.rmtree("docs")
+        for index in range(1, 4):
+            self.build(shard=(index, 3))
+
+        stats = self.merge()
+
+        self.assertEqual(stats["pages"], 8)
+        self.assertEqual(self.read_tree("docs"), expected)
+        manifest = BuildManifest.load(manifest_path_for("docs"))
+        self.assertEqual(len(manifest.pages), 8)
+        self.assertEqual(manifest.assets, {os.path.join("docs", "index.css")})
+        self.assertEqual(self.build()["generated"], 0)
+
+    def test_merge_builds_search_index(self):
+        self.run_quietly(SiteBuilder(search=True).build)
+        expected = self.read_tree("docs/search")
+        shutil.rmtree("docs")
+        os.remove(".docs.search.json")
+        for index in range(1, 3):
+            self.build(shard=(index, 2))
+        self.assertFalse(os.path.exists(shard_dest_dir("docs", 1, 2) + "/search"))
+
+        stats = self.merge(search=True)
+
+        self.assertEqual(stats["indexed"], 8)
+        self.assertEqual(self.read_tree("docs/search"), expected)
+
+    def test_only_first_shard_copies_assets(self):
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+        self.assertTrue(os.path.exists(shard_dest_dir("docs", 1, 2) + "/index.css"))
+        self.assertFalse(os.path.exists(shard_dest_dir("docs", 2, 2) + "/index.css"))
+
+    def test_merge_rejects_missing_shard(self):
+        self.build(shard=(1, 3))
+        self.build(shard=(3, 3))
+        with self.assertRaisesRegex(ValueError, "found 1/3, 3/3"):
+            self.merge()
+
+    def test_merge_rejects_overlapping_outputs(self):
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+        shutil.copy("static/index.css", shard_dest_dir("docs", 2, 2))
+        with self.assertRaisesRegex(ValueError, "Shards overlap: index.css"):
+            self.merge()
+
+    def test_merge_rejects_stale_partition(self):
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+        self.write("content/new/index.md", "# New")
+        with self.assertRaisesRegex(ValueError, "missing pages: content/new/index.md"):
+            self.merge()
+        shutil.rmtree("content/new")
+        shutil.rmtree("content/post0")
+        with self.assertRaisesRegex(ValueError, "not in content: content/post0"):
+            self.merge()
+
+    def test_merge_rejects_missing_output(self):
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+        shard = BuildManifest.load(manifest_path_for(shard_dest_dir("docs", 2, 2)))
+        os.remove(next(iter(shard.pages.values()))["dest_path"])
+        with self.assertRaisesRegex(ValueError, "missing the output"):
+            self.merge()
+
+    def test_merge_removes_orphans_from_previous_merge(self):
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+        self.merge()
+        shutil.rmtree("content/post6")
+        self.build(shard=(1, 2))
+        self.build(shard=(2, 2))
+
+        stats = self.merge()
+
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists("docs/post6"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import unittest
+
+from dependency_graph import PAGE
+from fixtures import SiteTestCase
+from site_builder import SiteBuilder
+
+
+class TestSiteBuilder(SiteTestCase):
+    files = {
+        **SiteTestCase.files,
+        "template.html": (
+            '<title>{{ Title }}</title><link href="/index.css">{{ Content }}'
+        ),
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.builder = SiteBuilder("/site/")
+        self.run_quietly(self.builder.build)
+
+    def test_build(self):
+        self.assertEqual(
+            self.read("docs/index.html"),
+            '<title>Home</title><link href="/site/index.css"><div><h1>Home</h1><p>Welcome</p></div>',
+        )
+        self.assertEqual(self.read("docs/index.css"), "body {}")
+        stats = self.run_quietly(SiteBuilder("/site/").build)
+        self.assertEqual(stats["generated"], 0)
+        self.assertEqual(stats["copied"], 0)
+
+    def test_build_without_manifest_removes_stale_outputs(self):
+        self.write("docs/old.html", "stale")
+        os.remove(".docs.manifest.json")
+        stats = self.run_quietly(SiteBuilder("/site/").build)
+        self.assertEqual(stats["generated"], 2)
+        self.assertFalse(os.path.exists("docs/old.html"))
+        self.assertTrue(os.path.exists("docs/index.css"))
+
+        stats = self.run_quietly(SiteBuilder("/site/").build)
+        self.assertEqual((stats["generated"], stats["copied"]), (0, 0))
+
+    def test_rebuild_changed_page_only(self):
+        self.write("content/blog/index.md", "# Blog\n\nNew post")
+        stats = self.run_quietly(
+            self.builder.rebuild, [os.path.join("content", "blog", "index.md")]
+        )
+        self.assertEqual(stats["generated"], 1)
+        self.assertIn("New post", self.read("docs/blog/index.html"))
+
+    def test_rebuild_new_and_deleted_pages(self):
+        self.write("content/about/index.md", "# About")
+        os.remove("content/blog/index.md")
+        stats = self.run_quietly(
+            self.builder.rebuild,
+            ["content/about/index.md", "content/blog/index.md"],
+        )
+        self.assertEqual(stats["generated"], 1)
+        self.assertEqual(stats["removed"], 1)
+        self.assertTrue(os.path.exists("docs/about/index.html"))
+        self.assertFalse(os.path.exists("docs/blog"))
+
+    def test_rebuild_template_regenerates_all_pages(self):
+        self.write("template.html", "<main>{{ Content }}</main>")
+        stats = self.run_quietly(self.builder.rebuild, ["template.html"])
+        self.assertEqual(stats["generated"], 2)
+        self.assertEqual(
+            self.read("docs/index.html"),
+            "<main><div><h1>Home</h1><p>Welcome</p></div></main>",
+        )
+
+    def test_rebuild_assets(self):
+        self.write("static/images/a.png", "png")
+        os.remove("static/index.css")
+        stats = self.run_quietly(
+            self.builder.rebuild, ["static/images/a.png", "static/index.css"]
+        )
+        self.assertEqual(stats["copied"], 1)
+        self.assertEqual(stats["deleted"], 1)
+        self.assertEqual(stats["generated"], 0)
+        self.assertTrue(os.path.exists("docs/images/a.png"))
+        self.assertFalse(os.path.exists("docs/index.css"))
+        self.assertTrue(os.path.exists("docs/index.html"))
+
+    def test_full_build_uses_extra_page_inputs(self):
+        page = os.path.join("content", "index.md")
+        self.write("data.json", "{}")
+        for pipeline in ["sync", "async"]:
+            with self.subTest(pipeline=pipeline):
+                builder = SiteBuilder("/site/", pipeline=pipeline)
+                builder.graph.add((PAGE, page), [page, "data.json"])
+                self.run_quietly(builder.build)
+                self.assertEqual(
+                    builder.manifest.pages[page]["inputs"].keys(),
+                    {page, "template.html", "data.json"},
+                )
+                self.assertEqual(self.run_quietly(builder.build)["generated"], 0)
+
+                self.write("data.json", f'{{"pipeline": "{pipeline}"}}')
+                stats = self.run_quietly(builder.build)
+                self.assertEqual(stats["generated"], 1)
+                self.assertEqual(builder.graph.affected(["data.json"]), {(PAGE, page)})
+
+    def test_precompressed_sidecars_follow_pages(self):
+        self.write("content/blog/index.md", "# Blog\n\n" + "Posts " * 100)
+        builder = SiteBuilder("/site/", compress=True)
+        stats = self.run_quietly(builder.build)
+        self.assertEqual(stats["compressed"] + stats["incompressible"], 3)
+        self.assertEqual(stats["generated"], 1)
+        self.assertTrue(os.path.exists("docs/blog/index.html.gz"))
+
+        os.remove("content/blog/index.md")
+        stats = self.run_quietly(builder.rebuild, ["content/blog/index.md"])
+        self.assertEqual(stats["compressed_removed"], 1)
+        self.assertFalse(os.path.exists("docs/blog"))
+
+    def test_disabling_precompress_removes_sidecars(self):
+        self.write("content/blog/index.md", "# Blog\n\n" + "Posts " * 100)
+        self.run_quietly(SiteBuilder("/site/", compress=True).build)
+        self.assertTrue(os.path.exists("docs/blog/index.html.gz"))
+
+        self.write("content/blog/index.md", "# Blog\n\n" + "New posts " * 100)
+        stats = self.run_quietly(SiteBuilder("/site/").build)
+        self.assertEqual(stats["compressed_removed"], 1)
+        self.assertFalse(os.path.exists("docs/blog/index.html.gz"))
+        self.assertTrue(os.path.exists("docs/blog/index.html"))
+
+    def test_rebuild_compresses_only_its_outputs(self):
+        builder = SiteBuilder("/site/", compress=True)
+        self.run_quietly(builder.build)
+        self.write("content/blog/index.md", "# Blog\n\n" + "New posts " * 100)
+        self.write("static/extra.css", "body { color: red; }\n" * 50)
+        stats = self.run_quietly(
+            builder.rebuild, ["content/blog/index.md", "static/extra.css"]
+        )
+        self.assertEqual(stats["compressed"], 2)
+        self.assertEqual(stats["compressed_unchanged"] + stats["incompressible"], 0)
+        self.assertTrue(os.path.exists("docs/blog/index.html.gz"))
+        self.assertTrue(os.path.exists("docs/extra.css.gz"))
+
+    def test_fingerprinted_assets(self):
+        builder = SiteBuilder("/site/", fingerprint=True)
+        stats = self.run_quietly(builder.build)
+        css = builder.asset_map["index.css"]
+        self.assertEqual(stats["generated"], 2)
+        self.assertEqual(stats["deleted"], 1)
+        self.assertFalse(os.path.exists("docs/index.css"))
+        self.assertTrue(os.path.exists(f"docs/{css}"))
+        self.assertIn(f'href="/site/{css}"', self.read("docs/index.html"))
+        self.assertIn(f"/site/{css}\n", self.read("docs/_headers"))
+
+        self.write("static/index.css", "body { margin: 0; }")
+        stats = self.run_quietly(builder.rebuild, ["static/index.css"])
+        new_css = builder.asset_map["index.css"]
+        self.assertEqual(stats["generated"], 2)
+        self.assertFalse(os.path.exists(f"docs/{css}"))
+        self.assertIn(f'href="/site/{new_css}"', self.read("docs/blog/index.html"))
+
+        stats = self.run_quietly(SiteBuilder("/site/").build)
+        self.assertEqual(stats["generated"], 2)
+        self.assertTrue(os.path.exists("docs/index.css"))
+        self.assertFalse(os.path.exists("docs/_headers"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -289,6 +289,31 @@ class TestSplitNodesLink(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+    def test_repeated_link_sliced_by_offset(self):
+        node = TextNode("[a](b)x[a](b)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("a", TextType.LINK, "b"),
+            TextNode("x", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+        ]
+        self.assertEqual(new_nodes, expected)
+
+    def test_link_after_identical_image_text(self):
+        node = TextNode("![a](b) [a](b)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("![a](b) ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+        ]
+        self.assertEqual(new_nodes, expected)
+
+    def test_thousands_of_links(self):
+        text = " ".join(f"[link{i}](url{i})" for i in range(5000))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 9999)
+        self.assertEqual(new_nodes[-1], TextNode("link4999", TextType.LINK, "url4999"))
+
 
 if __name__ == "__main__":
     unittest.main()
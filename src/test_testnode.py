@@ -24,6 +24,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, url="http://example.com")
         self.assertNotEqual(node1, node2)
 
+    def test_slots(self):
+        node = TextNode("text", TextType.LINK, url="https://boot.dev")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(text, link, https://boot.dev)")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
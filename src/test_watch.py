@@ -0,0 +1,75 @@
+import os
+import unittest
+from unittest import mock
+
+from fixtures import TempDirTestCase
+from watch import Watcher, changed_paths, snapshot, watch
+
+
+class TestWatch(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        self.write(self.template, "{{ Content }}")
+
+    def test_snapshot_walks_dirs_and_files(self):
+        files = snapshot([self.content, self.template, "missing"])
+        self.assertEqual(
+            sorted(files),
+            sorted([os.path.join(self.content, "blog", "index.md"), self.template]),
+        )
+
+    def test_changed_paths(self):
+        before = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        after = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(changed_paths(before, after), {"b", "c", "d"})
+
+    def test_watcher_debounces_bursts(self):
+        watcher = Watcher([self.content, self.template], debounce=0.5)
+        page = os.path.join(self.content, "blog", "index.md")
+        self.write(page, "# Blog\n\nedit one")
+        self.assertIsNone(watcher.poll(now=10.0))
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.assertIsNone(watcher.poll(now=10.2))
+        self.assertIsNone(watcher.poll(now=10.4))
+        self.assertEqual(watcher.poll(now=10.8), sorted([page, self.template]))
+        self.assertIsNone(watcher.poll(now=11.5))
+
+    def test_watcher_coalesces_writes_within_debounce_window(self):
+        watcher = Watcher([self.content])
+        page = os.path.join(self.content, "blog", "index.md")
+        new_page = os.path.join(self.content, "blog", "new.md")
+        self.write(page, "# Blog\n\nedit")
+        self.assertIsNone(watcher.poll(now=1.0))
+        self.write(new_page, "# New")
+        self.assertIsNone(watcher.poll(now=1.01))
+        self.assertIsNone(watcher.poll(now=1.02))
+        self.assertEqual(watcher.poll(now=1.04), sorted([page, new_page]))
+
+    def test_watch_sleeps_at_least_as_long_as_the_last_scan(self):
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                raise KeyboardInterrupt
+
+        with mock.patch("watch.time.sleep", sleep), mock.patch(
+            "watch.time.monotonic", side_effect=[0.0, 0.5]
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                watch([self.content], None, poll_interval=0.01)
+        self.assertEqual(sleeps, [0.01, 0.5])
+
+    def test_watcher_reports_deleted_files(self):
+        watcher = Watcher([self.content], debounce=0)
+        page = os.path.join(self.content, "blog", "index.md")
+        os.remove(page)
+        self.assertIsNone(watcher.poll(now=1.0))
+        self.assertEqual(watcher.poll(now=1.1), [page])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,8 @@
-from split_nodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
-from textnode import TextNode, TextType
+from scan_inline import scan_inline
+from textnode import TextNode
 
 
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return nodes
+    return [
+        TextNode(text, text_type, url) for text, text_type, url in scan_inline(text)
+    ]
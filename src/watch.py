@@ -0,0 +1,72 @@
+import os
+import time
+
+POLL_INTERVAL = 0.01
+DEBOUNCE = 0.02
+
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        if os.path.isdir(path):
+            scan_dir(path, files)
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            files[os.path.normpath(path)] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def scan_dir(dir_path, files):
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                scan_dir(entry.path, files)
+            elif entry.is_file():
+                stat = entry.stat()
+                files[os.path.normpath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+
+def changed_paths(before, after):
+    return {
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+class Watcher:
+    def __init__(self, paths, debounce=DEBOUNCE):
+        self.paths = paths
+        self.debounce = debounce
+        self.files = snapshot(paths)
+        self.pending = set()
+        self.last_change = None
+        self.scan_time = 0.0
+
+    def poll(self, now=None):
+        start = time.monotonic()
+        files = snapshot(self.paths)
+        self.scan_time = time.monotonic() - start
+        now = start if now is None else now
+        changes = changed_paths(self.files, files)
+        self.files = files
+        if changes:
+            self.pending |= changes
+            self.last_change = now
+            return None
+        if self.pending and now - self.last_change >= self.debounce:
+            batch = sorted(self.pending)
+            self.pending = set()
+            return batch
+        return None
+
+
+def watch(paths, on_change, poll_interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    watcher = Watcher(paths, debounce)
+    while True:
+        # On large trees a scan can take longer than the interval, so idle at
+        # least as long as the last scan instead of stat'ing in a busy loop.
+        time.sleep(max(poll_interval, watcher.scan_time))
+        batch = watcher.poll()
+        if batch:
+            on_change(batch)